@@ -1 +1,9 @@
-__all__ = ['load_data', 'test_plot']
\ No newline at end of file
+__all__ = ['load_data', 'test_plot']
+
+
+def __getattr__(name: str):
+    """ Import the package modules on first access, keeping 'import econ_ener' free of heavy dependencies """
+    if name in __all__:
+        import importlib
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,12 +1,29 @@
 from .src import interpreters as interp
+from .src import snapshot
 from .src.data_classes import GDPMetadata, GDPData, IEAData
 
 import os
 from os.path import join, split
 
 
-def load_data():
-    """ Load the economic and energy data """
+def load_data(snapshot_path: str = None):
+    """ Load the economic and energy data
+
+        :arg
+            | snapshot_path (str): optional path of a snapshot bundle. If the bundle is valid, the data is restored from
+                                   it, otherwise the data is loaded from the source files and the bundle is (re)written.
+        :returns
+            | (GDPData, GDPMetadata, IEAData): GDP data, GDP metadata and energy data
+        :raises
+            No exceptions raised.
+    """
+    if snapshot_path is not None and os.path.isfile(snapshot_path):
+        try:
+            return snapshot.load_snapshot(snapshot_path)
+        except (ValueError, OSError):
+            # Outdated, corrupted or unreadable bundles are rebuilt from the source files
+            pass
+
     data_directory = join(os.path.dirname(__file__), 'data')
 
     # [ECONOMIC DATA] GDP METADATA AND DATA
@@ -24,6 +41,35 @@ def load_data():
     parser_func, edge_cases = interp.build_GDPMetadata_parser_func(gdp_md)
     lni = interp.build_long_name_interpreter(parser_func, edge_cases)
 
-    nrg_data = IEAData(filepath_iea_data, long_name_interpreter=lni)
+    nrg_data = IEAData(filepath_iea_data, long_name_interpreter=lni, dependency_filepaths=[interp.edge_cases_filepath])
+
+    if snapshot_path is not None:
+        snapshot.save_snapshot(snapshot_path, gdp, gdp_md, nrg_data)
+
+    return gdp, gdp_md, nrg_data
+
+
+def refresh_data(gdp: GDPData, gdp_md: GDPMetadata, nrg_data: IEAData) -> dict[str]:
+    """ Reload only the datasets whose source files have changed since they were loaded
+
+        :arg
+            | gdp (GDPData): GDP data set
+            | gdp_md (GDPMetadata): GDP metadata set
+            | nrg_data (IEAData): energy data set
+        :returns
+            | (dict[str]): refresh status ('unchanged', 'appended' or 'reloaded') for each data set
+        :raises
+            No exceptions raised.
+    """
+    status = {'gdp': gdp.refresh(), 'gdp_md': gdp_md.refresh()}
+
+    # The country name interpreter of the energy data depends on the metadata and the edge case file. If either
+    # changed, the interpreter is rebuilt and the energy data re-ingested once.
+    if status['gdp_md'] == 'reloaded' or nrg_data.has_changed_dependencies():
+        parser_func, edge_cases = interp.build_GDPMetadata_parser_func(gdp_md)
+        nrg_data.long_name_interpreter = interp.build_long_name_interpreter(parser_func, edge_cases)
+        status['nrg_data'] = nrg_data.reload()
+    else:
+        status['nrg_data'] = nrg_data.refresh()
 
-    return gdp, gdp_md, nrg_data
\ No newline at end of file
+    return status
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import warnings
+
+from .data_classes import GDPMetadata
+
+statistics = ['sum', 'count', 'mean', 'weighted_mean', 'median']
+
+
+def align_matrix(matrix: pd.DataFrame, country_codes: list[str]) -> np.ndarray:
+    """ Returns the values of a (country x year) matrix reordered to match country_codes, NaN for missing countries """
+    return matrix.reindex(index=country_codes).to_numpy(dtype=float)
+
+
+def aggregate_by_group(matrix: pd.DataFrame, masks: np.ndarray, labels: list[str], country_codes: list[str],
+                       statistic='sum', weights: pd.DataFrame = None) -> pd.DataFrame:
+    """ Aggregate a (country x year) matrix for every group and year in one vectorized pass
+
+        Missing values are ignored. Groups without any value in a given year return NaN.
+
+        :arg
+            | matrix (pd.DataFrame): index is 'Country Code', columns are years, e.g. from IndicatorEngine.evaluate
+            | masks (np.ndarray): boolean (group x country) membership mask, e.g. GDPMetadata.region_masks
+            | labels (list[str]): names of the groups, matching the first axis of masks
+            | country_codes (list[str]): country codes matching the second axis of masks
+            | statistic (str): one of 'sum', 'count', 'mean', 'weighted_mean' or 'median'
+            | weights (pd.DataFrame): (country x year) matrix of weights (e.g. population or GDP), required for
+                                      'weighted_mean'
+        :returns
+            | (pd.DataFrame): index are the group labels, columns are the years of matrix
+        :raises
+            ValueError: is raised if the statistic is unknown or no weights are provided for 'weighted_mean'.
+    """
+    if statistic not in statistics:
+        raise ValueError(f'{statistic} is not a recognized statistic, use one of {statistics}.')
+
+    values = align_matrix(matrix, country_codes)
+    valid = np.isfinite(values)
+    if statistic == 'weighted_mean':
+        if weights is None:
+            raise ValueError('Weights are required to compute a weighted mean.')
+        weight_values = align_matrix(weights.reindex(columns=matrix.columns), country_codes)
+        valid &= np.isfinite(weight_values)
+    masks = np.asarray(masks, dtype=bool)
+
+    if statistic == 'median':
+        grouped_values = np.where(masks[:, :, np.newaxis] & valid[np.newaxis], values[np.newaxis], np.nan)
+        with warnings.catch_warnings():
+            # Groups without values in a given year are expected and return NaN
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            result = np.nanmedian(grouped_values, axis=1)
+    else:
+        membership = masks.astype(float)
+        count = membership @ valid.astype(float)
+        if statistic == 'count':
+            result = count
+        elif statistic == 'weighted_mean':
+            weighted_sum = membership @ np.where(valid, weight_values * values, 0)
+            weight_sum = membership @ np.where(valid, weight_values, 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result = np.where(count > 0, weighted_sum / weight_sum, np.nan)
+        else:
+            total = membership @ np.where(valid, values, 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result = np.where(count > 0, total if statistic == 'sum' else total / count, np.nan)
+
+    return pd.DataFrame(result, index=pd.Index(labels, name='Group'), columns=matrix.columns)
+
+
+def aggregate_by_region(matrix: pd.DataFrame, gdp_md: GDPMetadata, statistic='sum',
+                        weights: pd.DataFrame = None) -> pd.DataFrame:
+    """ Wrapper for aggregate_by_group using the region masks of the GDP metadata """
+    return aggregate_by_group(matrix, gdp_md.region_masks, gdp_md.regions, gdp_md.available_country_codes,
+                              statistic=statistic, weights=weights)
+
+
+def aggregate_by_income_group(matrix: pd.DataFrame, gdp_md: GDPMetadata, statistic='sum',
+                              weights: pd.DataFrame = None) -> pd.DataFrame:
+    """ Wrapper for aggregate_by_group using the income group masks of the GDP metadata """
+    return aggregate_by_group(matrix, gdp_md.income_group_masks, gdp_md.income_groups, gdp_md.available_country_codes,
+                              statistic=statistic, weights=weights)
@@ -0,0 +1,246 @@
+import numpy as np
+import pandas as pd
+
+
+class StorageBackend:
+    """ Parent class for the query tables of a WorldDataHandler
+
+        Data is always loaded as a pd.DataFrame (WorldDataHandler.data), which remains the reference copy used to build
+        country lists and to detect changes on refresh. The backend converts it once via from_pandas into its own
+        table format, through which all row filters, year pivots and value cubes of the handler are routed. Tables
+        returned by the query methods are therefore backend-specific.
+    """
+
+    name = None
+
+    def from_pandas(self, df: pd.DataFrame):
+        """ Convert the loaded pd.DataFrame into the table format of the backend
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+        """
+        return df
+
+    def to_pandas(self, table) -> pd.DataFrame:
+        """ Convert a table of the backend into a pd.DataFrame
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+        """
+        return table
+
+    def append_columns(self, table, data: pd.DataFrame, new_columns: list):
+        """ Returns the table of data, given the table created from data before new_columns were appended to it
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+        """
+        return self.from_pandas(data)
+
+    def filter_equal(self, table, column: str, value):
+        """ Returns all rows of table where column equals value
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+        """
+        return None
+
+    def filter_isin(self, table, column: str, values: list):
+        """ Returns all rows of table where column is any of values
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+        """
+        return None
+
+    def extract_values(self, table, key_columns: list, value_columns: list) -> (pd.DataFrame, np.ndarray):
+        """ Returns the key columns and the values of the value columns of all rows of a table
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+            :arg
+                | table: subsection of the data
+                | key_columns (list): columns identifying each row, e.g. ['Series Name', 'Country Code']
+                | value_columns (list): columns containing yearly values
+            :returns
+                | (pd.DataFrame): key columns with a default index
+                | (np.ndarray): (row x value column) array of floats, non-numeric values are NaN
+            :raises
+                No exceptions raised.
+        """
+        return None, None
+
+    def get_columns(self, table) -> list:
+        """ Returns the column titles of table
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+        """
+        return list()
+
+    def get_first_value(self, table, column: str):
+        """ Returns the value of column in the first row of table
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+        """
+        return None
+
+    def pivot_years(self, table, year_columns: dict[int], country_codes: list[str]) -> pd.DataFrame:
+        """ Convert rows of a table into a (country x year) matrix of floats
+
+            OVERWRITE FOR SPECIFIC BACKEND
+
+            :arg
+                | table: subsection of the data with at most one row per country code
+                | year_columns (dict[int]): columns containing yearly values as keys and their years as values
+                | country_codes (list[str]): country codes to keep, repeated country codes are dropped
+            :returns
+                | (pd.DataFrame): index is 'Country Code', columns are years (int), non-numeric values are NaN
+            :raises
+                No exceptions raised.
+        """
+        return None
+
+
+class PandasBackend(StorageBackend):
+    """ Default backend, the table is the loaded pd.DataFrame itself """
+
+    name = 'pandas'
+
+    def append_columns(self, table: pd.DataFrame, data: pd.DataFrame, new_columns: list) -> pd.DataFrame:
+        """ Overwrites the parent class function. """
+        return data
+
+    def filter_equal(self, table: pd.DataFrame, column: str, value) -> pd.DataFrame:
+        return table.loc[table[column] == value]
+
+    def filter_isin(self, table: pd.DataFrame, column: str, values: list) -> pd.DataFrame:
+        return table.loc[table[column].isin(values)]
+
+    def extract_values(self, table: pd.DataFrame, key_columns: list,
+                       value_columns: list) -> (pd.DataFrame, np.ndarray):
+        """ Overwrites the parent class function. """
+        values = table[value_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        return table[key_columns].reset_index(drop=True), values
+
+    def get_columns(self, table: pd.DataFrame) -> list:
+        return list(table.columns)
+
+    def get_first_value(self, table: pd.DataFrame, column: str):
+        return table[column].values[0]
+
+    def pivot_years(self, table: pd.DataFrame, year_columns: dict[int], country_codes: list[str]) -> pd.DataFrame:
+        """ Overwrites the parent class function. """
+        table = table.loc[table['Country Code'].isin(country_codes)]
+        matrix = table.set_index('Country Code')[list(year_columns.keys())]
+        matrix = matrix.loc[~matrix.index.duplicated()]
+        matrix = matrix.apply(pd.to_numeric, errors='coerce').astype(float)
+        return matrix.rename(columns=year_columns)
+
+
+class PolarsBackend(StorageBackend):
+    """ Query accelerator holding a copy of the data as a polars.DataFrame (Arrow columnar memory), filters, pivots
+        and value cubes run multi-threaded
+
+        The pandas copy of the handler is kept alongside, so the memory footprint roughly doubles. Polars requires
+        string column titles. Year columns stored as integers (IEA data) are converted to strings internally and
+        converted back for all results.
+    """
+
+    name = 'polars'
+
+    def __init__(self):
+        self.pl = self.import_polars()
+        self.original_columns = {}
+
+    def __getstate__(self) -> dict:
+        """ Modules can not be pickled, polars is imported again when unpickling """
+        state = self.__dict__.copy()
+        del state['pl']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.pl = self.import_polars()
+
+    @staticmethod
+    def import_polars():
+        try:
+            import polars
+        except ImportError:
+            raise ImportError('The polars backend requires the polars package (pip install polars pyarrow).')
+        return polars
+
+    def from_pandas(self, df: pd.DataFrame):
+        """ Overwrites the parent class function. """
+        self.original_columns = {}
+        return self.convert(df)
+
+    def convert(self, df: pd.DataFrame):
+        """ Convert a pd.DataFrame into a polars.DataFrame, recording the original column titles """
+        self.original_columns |= {str(column): column for column in df.columns}
+        df = df.rename(columns=str)
+        # Arrow columns require a single type: columns mixing numbers and strings (e.g. '..' for missing values) are
+        # stored as strings and parsed when pivoted
+        for column in df.columns:
+            if pd.api.types.infer_dtype(df[column], skipna=True).startswith('mixed'):
+                df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+        return self.pl.from_pandas(df)
+
+    def to_pandas(self, table) -> pd.DataFrame:
+        """ Overwrites the parent class function. """
+        return table.to_pandas().rename(columns=self.original_columns)
+
+    def append_columns(self, table, data: pd.DataFrame, new_columns: list):
+        """ Overwrites the parent class function. Only the new columns are converted """
+        return table.hstack(self.convert(data[new_columns]))
+
+    def filter_equal(self, table, column: str, value):
+        return table.filter(self.pl.col(str(column)) == value)
+
+    def filter_isin(self, table, column: str, values: list):
+        return table.filter(self.pl.col(str(column)).is_in(list(values)))
+
+    def extract_values(self, table, key_columns: list, value_columns: list) -> (pd.DataFrame, np.ndarray):
+        """ Overwrites the parent class function. """
+        pl = self.pl
+        values = table.select([pl.col(str(column)).cast(pl.Float64, strict=False) for column in value_columns])
+        keys = table.select([str(column) for column in key_columns]).to_pandas()
+        values = values.to_numpy().astype(float).reshape(len(table), len(value_columns))
+        return keys.rename(columns=self.original_columns), values
+
+    def get_columns(self, table) -> list:
+        return [self.original_columns.get(column, column) for column in table.columns]
+
+    def get_first_value(self, table, column: str):
+        return table[str(column)][0]
+
+    def pivot_years(self, table, year_columns: dict[int], country_codes: list[str]) -> pd.DataFrame:
+        """ Overwrites the parent class function. """
+        pl = self.pl
+        table = table.filter(pl.col('Country Code').is_in(list(country_codes)))
+        table = table.unique(subset=['Country Code'], keep='first', maintain_order=True)
+        table = table.select([pl.col('Country Code')] +
+                             [pl.col(str(column)).cast(pl.Float64, strict=False) for column in year_columns.keys()])
+        matrix = table.to_pandas().set_index('Country Code')
+        return matrix.rename(columns={str(column): year for column, year in year_columns.items()}).astype(float)
+
+
+backends = {PandasBackend.name: PandasBackend, PolarsBackend.name: PolarsBackend}
+
+
+def create_backend(name: str) -> StorageBackend:
+    """ Returns a new storage backend instance
+
+        :arg
+            | name (str): 'pandas' or 'polars'
+        :returns
+            | (StorageBackend): backend instance
+        :raises
+            KeyError: is raised if the backend name is unknown.
+            ImportError: is raised if the packages required by the backend are not installed.
+    """
+    if name not in backends:
+        raise KeyError(f'{name} is not recognized as a storage backend, use one of {list(backends.keys())}.')
+    return backends[name]()
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import time
+
+from .data_classes import GDPData
+
+
+class SyntheticGDPData(GDPData):
+    """ GDPData reading the UTF-8 files written by create_synthetic_gdp_data on every platform """
+    encoding = 'utf-8'
+
+
+def create_synthetic_gdp_data(filepath: str, n_countries=2000, n_series=50, years=range(1960, 2023),
+                              missing_fraction=0.1, seed=0):
+    """ Write a synthetic large-scale dataset in the format of a World Bank export
+
+        :arg
+            | filepath (str): path of the tab-separated file to write
+            | n_countries (int): number of country codes
+            | n_series (int): number of series per country
+            | years (range): years for which columns are created
+            | missing_fraction (float): fraction of values written as '..'
+            | seed (int): seed of the random number generator
+        :returns
+            | None
+        :raises
+            No exceptions raised.
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+    country_codes = [''.join(code) for code in rng.choice(letters, size=(n_countries * 2, 3))]
+    country_codes = list(dict.fromkeys(country_codes))[:n_countries]
+
+    series_names = np.repeat([f'Synthetic series {idx}' for idx in range(n_series)], len(country_codes))
+    series_codes = np.repeat([f'SY.NTH.{idx}' for idx in range(n_series)], len(country_codes))
+    codes = np.tile(country_codes, n_series)
+
+    df = pd.DataFrame({'Series Name': series_names,
+                       'Series Code': series_codes,
+                       'Country Name': [f'Country {code}' for code in codes],
+                       'Country Code': codes})
+    values = rng.lognormal(8, 1, size=(len(df), len(years))).astype(str).astype(object)
+    values[rng.random(values.shape) < missing_fraction] = '..'
+    year_frame = pd.DataFrame(values, columns=[f'{year} [YR{year}]' for year in years])
+    pd.concat([df, year_frame], axis=1).to_csv(filepath, sep='\t', index=False, encoding=SyntheticGDPData.encoding)
+
+
+def benchmark_backends(filepath: str, backend_names=('pandas', 'polars'), n_queries=200, seed=0,
+                       verbose=True, handler_class=SyntheticGDPData) -> pd.DataFrame:
+    """ Compare the storage backends of GDPData on a dataset, e.g. created via create_synthetic_gdp_data
+
+        :arg
+            | filepath (str): path of a dataset in the format of a World Bank export
+            | backend_names (tuple[str]): names of the backends to compare
+            | n_queries (int): number of random per-country queries
+            | seed (int): seed of the random number generator picking the queried countries
+            | verbose (bool): if True prints the results
+            | handler_class (type): GDPData (sub)class loading the dataset, its encoding attribute has to match the file
+        :returns
+            | (pd.DataFrame): runtime in seconds for each backend (columns) and operation (index)
+        :raises
+            ImportError: is raised if the packages required by a backend are not installed.
+    """
+    results = {}
+    for backend_name in backend_names:
+        timings = {}
+
+        start = time.perf_counter()
+        gdp = handler_class(filepath, backend=backend_name)
+        timings['load'] = time.perf_counter() - start
+
+        rng = np.random.default_rng(seed)
+        country_codes = rng.choice(np.unique(gdp.available_country_codes), size=n_queries)
+        series_names = gdp.data['Series Name'].unique()
+
+        start = time.perf_counter()
+        for country_code in country_codes:
+            gdp.get_info(country_code)
+        timings['get_info'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for country_code in country_codes:
+            gdp.create_timeseries_for_country_by_series_name(country_code, series_names[0])
+        timings['create_time_series_for_info'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for series_name in series_names:
+            gdp.create_matrix_by_series_name(series_name)
+        timings['create_matrix_by_series_name'] = time.perf_counter() - start
+
+        results[backend_name] = timings
+
+    results = pd.DataFrame(results)
+    if verbose:
+        print(f'Runtime (s) for {n_queries} per-country queries and {len(series_names)} series pivots:')
+        print(results.to_string(float_format=lambda value: f'{value:.4f}'))
+    return results
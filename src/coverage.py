@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from .data_classes import GDPData, IEAData, DerivedData, get_derived_data
+from .indicators import ELECTRICITY_FLOW, SUPPLY_FLOW
+
+# Flows for which negative totals are considered anomalous
+anomaly_flows = [ELECTRICITY_FLOW, SUPPLY_FLOW]
+
+
+class CoverageIndex(DerivedData):
+    """ Bitmap of non-missing values along (indicator x country x year) for GDP series and IEA flow/product pairs
+
+        Indicators are identified by the GDP series name (str) or the IEA (flow, product) pair (tuple). The index is
+        computed once and answers coverage queries via boolean array operations.
+    """
+
+    def __init__(self, gdp: GDPData, nrg_data: IEAData):
+        super().__init__(gdp, nrg_data)
+
+        gdp_keys, gdp_codes, gdp_years, gdp_values = gdp.create_series_cube()
+        iea_keys, iea_codes, iea_years, iea_values = nrg_data.create_flow_and_product_cube()
+
+        self.indicators = list(gdp_keys) + list(iea_keys)
+        self.indicator_index = {indicator: idx for idx, indicator in enumerate(self.indicators)}
+        self.country_codes = pd.Index(sorted(set(gdp_codes).union(iea_codes)), dtype=object)
+        self.years = np.array(sorted(set(gdp_years).union(iea_years)))
+
+        self.bitmap = np.zeros((len(self.indicators), len(self.country_codes), len(self.years)), dtype=bool)
+        for offset, codes, years, values in [(0, gdp_codes, gdp_years, gdp_values),
+                                             (len(gdp_keys), iea_codes, iea_years, iea_values)]:
+            country_ids = self.country_codes.get_indexer(codes)
+            year_ids = np.searchsorted(self.years, years)
+            indicator_ids = offset + np.arange(values.shape[0])
+            self.bitmap[np.ix_(indicator_ids, country_ids, year_ids)] = np.isfinite(values)
+
+        self.anomalies = self.find_anomalies(iea_keys, iea_codes, iea_years, iea_values)
+
+    def get_indicator_ids(self, indicators: list) -> np.ndarray:
+        """ Returns the position of the indicators along the first axis of the bitmap
+
+            :raises
+                KeyError: is raised if an indicator is not part of the index.
+        """
+        ids = []
+        for indicator in indicators:
+            if indicator not in self.indicator_index:
+                raise KeyError(f'{indicator} is not recognized as an available indicator.')
+            ids.append(self.indicator_index[indicator])
+        return np.array(ids, dtype=int)
+
+    def get_year_id(self, year: int) -> int:
+        """ Returns the position of the year along the last axis of the bitmap
+
+            :raises
+                KeyError: is raised if the year is not covered by any data set.
+        """
+        year_id = np.searchsorted(self.years, year)
+        if year_id >= len(self.years) or self.years[year_id] != year:
+            raise KeyError(f'{year} is not recognized as an available year.')
+        return year_id
+
+    def get_completeness(self, indicators: list, country_codes: list[str] = None) -> np.ndarray:
+        """ Returns a boolean (country x year) array, True where values for all indicators are available
+
+            :arg
+                | indicators (list): GDP series names and/or IEA (flow, product) pairs
+                | country_codes (list[str]): optional subset of country codes, all countries if None
+            :returns
+                | (np.ndarray): boolean array, rows match country_codes (or self.country_codes), columns self.years
+            :raises
+                KeyError: is raised if an indicator is not part of the index.
+        """
+        complete = self.bitmap[self.get_indicator_ids(indicators)].all(axis=0)
+        if country_codes is not None:
+            country_ids = self.country_codes.get_indexer(country_codes)
+            complete = np.where((country_ids >= 0)[:, np.newaxis], complete[country_ids], False)
+        return complete
+
+    def find_complete_countries(self, indicators: list, year: int, country_codes: list[str] = None) -> list[str]:
+        """ Returns all country codes with values for all indicators in a given year """
+        complete = self.get_completeness(indicators, country_codes)[:, self.get_year_id(year)]
+        candidates = self.country_codes if country_codes is None else pd.Index(country_codes, dtype=object)
+        return candidates[complete].to_list()
+
+    def count_complete_countries(self, indicators: list, country_codes: list[str] = None) -> pd.Series:
+        """ Returns the number of countries with values for all indicators for each year """
+        return pd.Series(self.get_completeness(indicators, country_codes).sum(axis=0), index=self.years)
+
+    def find_best_year(self, indicators: list, country_codes: list[str] = None) -> int:
+        """ Returns the year in which the most countries have values for all indicators, the latest year on ties """
+        counts = self.get_completeness(indicators, country_codes).sum(axis=0)
+        return int(self.years[len(counts) - 1 - np.argmax(counts[::-1])])
+
+    @staticmethod
+    def find_anomalies(keys: list[tuple], country_codes: list[str], years: np.ndarray,
+                       values: np.ndarray) -> pd.DataFrame:
+        """ Flag negative totals of anomaly_flows and products exceeding 100% of the total of their flow
+
+            :arg
+                | keys (list[tuple]): (flow, product) pairs, see IEAData.create_flow_and_product_cube
+                | country_codes (list[str]): country codes matching the second axis of values
+                | years (np.ndarray): years matching the last axis of values
+                | values (np.ndarray): (flow/product x country x year) array
+            :returns
+                | (pd.DataFrame): one row per anomaly with the columns 'Country Code', 'Year', 'Flow', 'Product',
+                                  'Value', 'Total' and 'Anomaly'
+            :raises
+                No exceptions raised.
+        """
+        keys = pd.MultiIndex.from_tuples(keys, names=['Flow', 'Product'])
+        total_ids = keys.get_indexer([(flow, 'Total') for flow in keys.get_level_values('Flow')])
+        has_total = total_ids >= 0
+        totals = np.where(has_total[:, np.newaxis, np.newaxis], values[np.clip(total_ids, 0, None)], np.nan)
+        is_total = has_total & (total_ids == np.arange(len(keys)))
+
+        with np.errstate(invalid='ignore'):
+            negative_total = is_total[:, np.newaxis, np.newaxis] & \
+                             keys.get_level_values('Flow').isin(anomaly_flows)[:, np.newaxis, np.newaxis] & \
+                             (values < 0)
+            share_above_100 = ~is_total[:, np.newaxis, np.newaxis] & (totals > 0) & (values > totals)
+
+        anomalies = []
+        for description, flags in [('Negative total', negative_total), ('Share above 100%', share_above_100)]:
+            key_ids, country_ids, year_ids = np.nonzero(flags)
+            anomalies.append(pd.DataFrame({'Country Code': np.asarray(country_codes, dtype=object)[country_ids],
+                                           'Year': years[year_ids],
+                                           'Flow': keys.get_level_values('Flow')[key_ids],
+                                           'Product': keys.get_level_values('Product')[key_ids],
+                                           'Value': values[key_ids, country_ids, year_ids],
+                                           'Total': totals[key_ids, country_ids, year_ids],
+                                           'Anomaly': description}))
+        return pd.concat(anomalies, ignore_index=True)
+
+
+def get_coverage_index(gdp: GDPData, nrg_data: IEAData) -> CoverageIndex:
+    """ Returns the CoverageIndex for the provided data sets, building it on first use or after the data changed """
+    return get_derived_data(nrg_data, 'coverage_index', CoverageIndex, gdp, nrg_data)
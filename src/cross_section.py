@@ -0,0 +1,227 @@
+import numpy as np
+import pandas as pd
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from .data_classes import GDPData, GDPMetadata, IEAData
+from .panel import get_panel
+
+# All statistics are computed across countries for every group (e.g. region) and year at once. Arrays have the shape
+# (group x country x year): x, y and weights are (country x year) matrices broadcast against (group x country) masks.
+
+
+def weighted_fit(x: np.ndarray, y: np.ndarray, weights: np.ndarray) -> dict[np.ndarray]:
+    """ Weighted Pearson correlation and least-squares fit y = intercept + slope * x along the country axis
+
+        :arg
+            | x (np.ndarray): independent variable, country axis second to last
+            | y (np.ndarray): dependent variable, broadcastable against x
+            | weights (np.ndarray): non-negative weights, zero or NaN to exclude an entry
+        :returns
+            | (dict[np.ndarray]): 'n' (number of countries), 'r', 'slope' and 'intercept', each with the country axis
+                                  removed; NaN where fewer than three countries are available
+        :raises
+            No exceptions raised.
+    """
+    valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(weights) & (weights > 0)
+    w = np.where(valid, weights, 0)
+    x, y = np.where(valid, x, 0), np.where(valid, y, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sum_w = w.sum(axis=-2)
+        mean_x = (w * x).sum(axis=-2) / sum_w
+        mean_y = (w * y).sum(axis=-2) / sum_w
+        dx = np.where(valid, x - mean_x[..., np.newaxis, :], 0)
+        dy = np.where(valid, y - mean_y[..., np.newaxis, :], 0)
+        sxx, syy, sxy = (w * dx * dx).sum(axis=-2), (w * dy * dy).sum(axis=-2), (w * dx * dy).sum(axis=-2)
+
+        n = valid.sum(axis=-2)
+        enough = n >= 3
+        slope = sxy / sxx
+        return {'n': n,
+                'r': np.where(enough, sxy / np.sqrt(sxx * syy), np.nan),
+                'slope': np.where(enough, slope, np.nan),
+                'intercept': np.where(enough, mean_y - slope * mean_x, np.nan)}
+
+
+def rank_within_groups(values: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """ Average ranks of values across the countries of each group, for every year
+
+        :arg
+            | values (np.ndarray): (country x year) matrix
+            | masks (np.ndarray): boolean (group x country) membership mask
+        :returns
+            | (np.ndarray): (group x country x year) ranks, NaN for missing values and countries outside the group
+        :raises
+            No exceptions raised.
+    """
+    grouped = np.where(masks[:, :, np.newaxis], values[np.newaxis], np.nan)
+    n_groups, n_countries, n_years = grouped.shape
+    # Rank all (group, year) columns in one call, pandas averages ties and ignores NaN
+    columns = grouped.transpose(1, 0, 2).reshape(n_countries, n_groups * n_years)
+    ranks = pd.DataFrame(columns).rank(axis=0).to_numpy()
+    return ranks.reshape(n_countries, n_groups, n_years).transpose(1, 0, 2)
+
+
+def compute_cross_sectional_statistics(x: np.ndarray, y: np.ndarray, weights: np.ndarray, masks: np.ndarray,
+                                       log_x=True) -> dict[np.ndarray]:
+    """ Pearson and Spearman correlations and a weighted log-linear fit for every group and year
+
+        :arg
+            | x (np.ndarray): (country x year) matrix of the independent variable, e.g. GDP per capita
+            | y (np.ndarray): (country x year) matrix of the dependent variable, e.g. renewable share
+            | weights (np.ndarray): (country x year) matrix of regression weights, e.g. total energy supply
+            | masks (np.ndarray): boolean (group x country) membership mask
+            | log_x (bool): if True, correlations and fits use log10(x)
+        :returns
+            | (dict[np.ndarray]): (group x year) arrays 'n', 'pearson_r', 'spearman_r', 'weighted_r',
+                                  'weighted_slope' and 'weighted_intercept'
+        :raises
+            No exceptions raised.
+    """
+    if log_x:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.where(x > 0, np.log10(x), np.nan)
+    membership = masks[:, :, np.newaxis].astype(float)
+
+    unweighted = weighted_fit(x, y, membership)
+    ranks_x, ranks_y = rank_within_groups(np.where(np.isfinite(y), x, np.nan), masks), \
+        rank_within_groups(np.where(np.isfinite(x), y, np.nan), masks)
+    ranked = weighted_fit(ranks_x, ranks_y, membership)
+    weighted = weighted_fit(x, y, membership * weights[np.newaxis])
+
+    return {'n': unweighted['n'],
+            'pearson_r': unweighted['r'],
+            'spearman_r': ranked['r'],
+            'weighted_r': weighted['r'],
+            'weighted_slope': weighted['slope'],
+            'weighted_intercept': weighted['intercept']}
+
+
+def bootstrap_chunk(x: np.ndarray, y: np.ndarray, weights: np.ndarray, masks: np.ndarray, n_replicates: int,
+                    seed) -> dict[np.ndarray]:
+    """ Bootstrap replicates of the Pearson correlation and weighted fit, resampling countries within each group
+
+        Resampling countries with replacement is expressed as multinomial frequency weights, so every replicate is
+        evaluated for all groups and years at once.
+
+        :returns
+            | (dict[np.ndarray]): (replicate x group x year) arrays 'pearson_r', 'weighted_r' and 'weighted_slope'
+    """
+    rng = np.random.default_rng(seed)
+    n_groups, n_countries = masks.shape
+    counts = np.zeros((n_replicates, n_groups, n_countries))
+    for group_idx in range(n_groups):
+        members = np.flatnonzero(masks[group_idx])
+        if len(members) > 0:
+            counts[:, group_idx, members] = rng.multinomial(len(members), np.full(len(members), 1 / len(members)),
+                                                            size=n_replicates)
+
+    frequency = counts[..., np.newaxis]
+    unweighted = weighted_fit(x, y, frequency)
+    weighted = weighted_fit(x, y, frequency * weights)
+    return {'pearson_r': unweighted['r'], 'weighted_r': weighted['r'], 'weighted_slope': weighted['slope']}
+
+
+def bootstrap_confidence_intervals(x: np.ndarray, y: np.ndarray, weights: np.ndarray, masks: np.ndarray,
+                                   n_bootstrap=1000, confidence=0.95, log_x=True, seed=0, n_processes=None,
+                                   chunk_size=50) -> dict[np.ndarray]:
+    """ Percentile bootstrap confidence intervals for the Pearson correlation and the weighted fit
+
+        :arg
+            | x, y, weights, masks, log_x: see compute_cross_sectional_statistics
+            | n_bootstrap (int): number of bootstrap replicates
+            | confidence (float): confidence level of the intervals
+            | seed (int): seed of the random number generators, results are independent of n_processes
+            | n_processes (int): number of worker processes, replicates are computed in this process if None
+            | chunk_size (int): number of replicates evaluated at once, limits the memory footprint
+        :returns
+            | (dict[np.ndarray]): (group x year) arrays '<statistic>_lower' and '<statistic>_upper' for 'pearson_r',
+                                  'weighted_r' and 'weighted_slope'
+        :raises
+            No exceptions raised.
+    """
+    if log_x:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.where(x > 0, np.log10(x), np.nan)
+
+    chunk_sizes = [min(chunk_size, n_bootstrap - start) for start in range(0, n_bootstrap, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    arguments = [(x, y, weights, masks, size, chunk_seed) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    if n_processes is None:
+        chunks = [bootstrap_chunk(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=n_processes) as executor:
+            chunks = list(executor.map(bootstrap_chunk, *zip(*arguments)))
+
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for statistic in chunks[0].keys():
+        replicates = np.concatenate([chunk[statistic] for chunk in chunks], axis=0)
+        with warnings.catch_warnings():
+            # Groups without enough countries in a given year are expected and return NaN
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            intervals[f'{statistic}_lower'], intervals[f'{statistic}_upper'] = \
+                np.nanquantile(replicates, [alpha, 1 - alpha], axis=0)
+    return intervals
+
+
+def create_cross_sectional_inputs(gdp: GDPData, gdp_md: GDPMetadata, nrg_data: IEAData,
+                                  x_indicator='gdp_per_capita', y_indicator='supply_renewable_share',
+                                  weight_indicator='supply_export_adjusted_total') -> dict:
+    """ Aligned (country x year) matrices and (group x country) masks from the GDP-energy panel
+
+        Groups are 'All' (every country within a continental region) followed by the regions of the GDP metadata.
+        Aggregates such as 'WLD' have no continental region and are therefore excluded.
+
+        :returns
+            | (dict): 'x', 'y', 'weights' (np.ndarray), 'masks' (np.ndarray), 'groups' (list[str]),
+                      'country_codes' (list[str]) and 'years' (np.ndarray)
+    """
+    panel = get_panel(gdp, gdp_md, nrg_data).data
+    matrices = {key: panel[indicator].unstack('Year') for key, indicator in
+                [('x', x_indicator), ('y', y_indicator), ('weights', weight_indicator)]}
+    country_codes = matrices['x'].index.to_list()
+
+    regions = panel['Region'].groupby(level='Country Code').first().reindex(country_codes).to_numpy()
+    region_masks = regions[np.newaxis, :] == np.array(gdp_md.regions, dtype=object)[:, np.newaxis]
+    masks = np.concatenate([region_masks.any(axis=0, keepdims=True), region_masks], axis=0)
+
+    inputs = {key: matrix.to_numpy(dtype=float) for key, matrix in matrices.items()}
+    inputs |= {'masks': masks, 'groups': ['All'] + list(gdp_md.regions), 'country_codes': country_codes,
+               'years': matrices['x'].columns.to_numpy()}
+    return inputs
+
+
+def cross_sectional_statistics(gdp: GDPData, gdp_md: GDPMetadata, nrg_data: IEAData,
+                               x_indicator='gdp_per_capita', y_indicator='supply_renewable_share',
+                               weight_indicator='supply_export_adjusted_total', log_x=True,
+                               n_bootstrap=0, confidence=0.95, seed=0, n_processes=None) -> pd.DataFrame:
+    """ Statistics of the relationship between GDP per capita and renewable uptake for every region and year
+
+        :arg
+            | gdp (GDPData): GDP data set
+            | gdp_md (GDPMetadata): GDP metadata set
+            | nrg_data (IEAData): energy data set
+            | x_indicator, y_indicator, weight_indicator (str): names of derived indicators, see src.indicators
+            | log_x (bool): if True, correlations and fits use log10 of the x indicator
+            | n_bootstrap (int): number of bootstrap replicates for confidence intervals, none are computed if 0
+            | confidence (float): confidence level of the bootstrap intervals
+            | seed (int): seed of the bootstrap
+            | n_processes (int): number of worker processes for the bootstrap, single process if None
+        :returns
+            | (pd.DataFrame): MultiIndex ('Group', 'Year'), one column per statistic
+        :raises
+            No exceptions raised.
+    """
+    inputs = create_cross_sectional_inputs(gdp, gdp_md, nrg_data, x_indicator, y_indicator, weight_indicator)
+    args = (inputs['x'], inputs['y'], inputs['weights'], inputs['masks'])
+
+    results = compute_cross_sectional_statistics(*args, log_x=log_x)
+    if n_bootstrap > 0:
+        results |= bootstrap_confidence_intervals(*args, n_bootstrap=n_bootstrap, confidence=confidence,
+                                                  log_x=log_x, seed=seed, n_processes=n_processes)
+
+    index = pd.MultiIndex.from_product([inputs['groups'], inputs['years']], names=['Group', 'Year'])
+    return pd.DataFrame({name: values.ravel() for name, values in results.items()}, index=index)
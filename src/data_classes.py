@@ -1,6 +1,68 @@
 import pandas as pd
 import numpy as np
+import hashlib
 import re
+from collections import namedtuple
+
+from .backends import create_backend
+from .query_cache import QueryCache, CacheInfo, cached_query
+from .registry import ignored_country_codes
+
+
+def create_file_fingerprint(filepath: str) -> str:
+    """ Returns the SHA-256 digest of a file """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DerivedData:
+    """ Parent class for objects computed from one or more data handlers, e.g. indicator engines or panels
+
+        Keeps references to the handlers and their data versions at build time, so stale objects can be detected.
+    """
+
+    def __init__(self, *handlers):
+        self.handlers = handlers
+        self.data_versions = self.get_data_versions()
+
+    def get_data_versions(self) -> tuple[int]:
+        return tuple(handler.data_version for handler in self.handlers)
+
+    def is_outdated(self) -> bool:
+        """ True if the data of any of the handlers changed after the object was built """
+        return self.get_data_versions() != self.data_versions
+
+    def is_built_from(self, handlers: tuple) -> bool:
+        """ True if the object was built from exactly the given handler instances """
+        return len(handlers) == len(self.handlers) and all(a is b for a, b in zip(handlers, self.handlers))
+
+
+def get_derived_data(owner, key: str, derived_class, *handlers) -> DerivedData:
+    """ Returns the object stored under key in owner.derived_data, (re)building it via derived_class(*handlers) if it
+        does not exist, was built from other handler instances or any of the handlers changed since
+
+        :arg
+            | owner (WorldDataHandler): handler storing the object in its derived_data
+            | key (str): key of the object within derived_data
+            | derived_class (type): subclass of DerivedData taking the handlers as arguments
+            | handlers (WorldDataHandler): handlers the object is built from
+        :returns
+            | (DerivedData): up-to-date object
+        :raises
+            No exceptions raised.
+    """
+    derived = owner.derived_data.get(key)
+    if derived is None or not derived.is_built_from(handlers) or derived.is_outdated():
+        derived = derived_class(*handlers)
+        owner.derived_data[key] = derived
+    return derived
+
+
+# Result of GDPDataHandler.get_series_cube: (series x country x year) values and the labels of each axis
+SeriesCube = namedtuple('SeriesCube', ['values', 'series', 'country_codes', 'years'])
 
 
 class WorldDataHandler:
@@ -8,15 +70,189 @@ class WorldDataHandler:
 
     continent_descriptors = ['Africa', 'America', 'Asia', 'Europe', 'Pacific', 'Middle East']
 
-    def __init__(self, filepath):
+    # Columns added to self.data after loading, which are not part of the source file
+    derived_columns = []
+
+    def __init__(self, filepath, backend='pandas', dependency_filepaths: list[str] = ()):
         # Load data
         self.filepath = filepath
+        self.fingerprint = self.create_fingerprint()
+        # Other files the loaded data depends on (e.g. the country name edge cases used by an interpreter)
+        self.dependency_filepaths = list(dependency_filepaths)
+        self.dependency_fingerprints = self.create_dependency_fingerprints()
         self.data = self.load_data()
+        # Storage backend used for all queries, holds self.data converted into its own table format. self.data remains
+        # the reference copy used to build country lists and to detect changes on refresh.
+        self.backend = create_backend(backend)
+        self.table = self.backend.from_pandas(self.data)
+        # Incremented whenever self.data changes, allows dependent caches to detect stale entries
+        self.data_version = 0
+        # Storage for objects derived from self.data (e.g. indicator engines), dropped whenever self.data changes
+        self.derived_data = {}
+        # Optional result cache of the query methods, see enable_query_cache
+        self.query_cache = None
+        # Optional CountryRegistry, see attach_registry
+        self.registry = None
+        self.registry_name = None
+        self.registry_ids = None
 
         # Create a list of all available country codes and names
         self.available_country_codes = self.create_country_code_list()
         self.available_long_names = self.create_long_name_list()
 
+    def __getstate__(self) -> dict:
+        """ Objects derived from self.data are caches and are not included when pickling (e.g. for snapshots) """
+        state = self.__dict__.copy()
+        state['derived_data'] = {}
+        return state
+
+    def create_fingerprint(self) -> str:
+        """ Create a fingerprint of the source file to detect changes to the data on disk """
+        return create_file_fingerprint(self.filepath)
+
+    def create_dependency_fingerprints(self) -> dict[str]:
+        """ Create fingerprints of all dependency files, keyed by their path """
+        return {filepath: create_file_fingerprint(filepath) for filepath in self.dependency_filepaths}
+
+    def has_changed_dependencies(self) -> bool:
+        """ True if any dependency file has changed since the data was loaded """
+        return self.create_dependency_fingerprints() != self.dependency_fingerprints
+
+    def refresh(self) -> str:
+        """ Reload the data if the source file has changed since it was last loaded
+
+            If the new file only adds year columns to the existing data (e.g. a new '2023 [YR2023]' column in a World
+            Bank export) and all existing values are unchanged, the new columns are appended to self.data without the
+            post-processing of load_data (e.g. the IEA name interpreter). Otherwise, including revised values of
+            existing years, the data is re-ingested via reload and all dependent lists are rebuilt.
+
+            Changes to dependency files are not handled here, as they usually require rebuilding the objects reading
+            them first (see load_data.refresh_data).
+
+            :arg
+                | None
+            :returns
+                | (str): 'unchanged' if the source file is unchanged, 'appended' if only year columns were added,
+                           'reloaded' if the data was re-ingested
+            :raises
+                No exceptions raised.
+        """
+        fingerprint = self.create_fingerprint()
+        if fingerprint == self.fingerprint:
+            return 'unchanged'
+
+        new_data = self.load_appended_year_columns()
+        if new_data is None:
+            return self.reload()
+
+        self.data = pd.concat([self.data, new_data], axis=1)
+        self.table = self.backend.append_columns(self.table, self.data, list(new_data.columns))
+        self.fingerprint = fingerprint
+        self.data_version += 1
+        self.invalidate(rows_changed=False)
+        return 'appended'
+
+    def reload(self) -> str:
+        """ Re-ingest the source file and rebuild all information derived from the data
+
+            :arg
+                | None
+            :returns
+                | (str): 'reloaded'
+            :raises
+                No exceptions raised.
+        """
+        self.fingerprint = self.create_fingerprint()
+        self.dependency_fingerprints = self.create_dependency_fingerprints()
+        self.data = self.load_data()
+        self.table = self.backend.from_pandas(self.data)
+        self.data_version += 1
+        self.invalidate(rows_changed=True)
+        return 'reloaded'
+
+    def load_appended_year_columns(self) -> pd.DataFrame:
+        """ Load the year columns of the source file that are missing from self.data
+
+            Only the column titles are read to detect new columns. The existing columns are parsed alongside the new
+            year columns to make sure neither the rows nor the values of earlier years (e.g. revised historical values
+            of a new export) have changed.
+
+            :arg
+                | None
+            :returns
+                | (pd.DataFrame): new year columns, aligned with self.data. None if columns were removed or reordered,
+                                  non-year columns were added or any of the existing values differ.
+            :raises
+                No exceptions raised.
+        """
+        column_titles = self.load_column_titles()
+        source_columns = [column for column in self.data.columns if column not in self.derived_columns]
+        if [column for column in column_titles if column in source_columns] != source_columns:
+            return None
+
+        new_columns = [column for column in column_titles if column not in source_columns]
+        if not new_columns or not all(self.extract_year_from_column(column) for column in new_columns):
+            return None
+
+        new_data = self.load_columns(source_columns + new_columns)
+        if not self.data[source_columns].equals(new_data[source_columns]):
+            return None
+        return new_data[new_columns]
+
+    def invalidate(self, rows_changed: bool):
+        """ Invalidate information derived from self.data after it has changed
+
+            :arg
+                | rows_changed (bool): True if rows were added, removed or modified. Lists derived from the rows
+                                       (country codes, names, etc.) are only rebuilt in this case.
+            :returns
+                | None
+            :raises
+                No exceptions raised.
+        """
+        self.derived_data = {}
+        if self.query_cache is not None:
+            self.query_cache.clear()
+        if rows_changed:
+            self.available_country_codes = self.create_country_code_list()
+            self.available_long_names = self.create_long_name_list()
+            if self.registry is not None:
+                self.attach_registry(self.registry, self.registry_name)
+
+    def enable_query_cache(self, maxsize=256):
+        """ Cache the results of the query methods, keeping up to maxsize results (least recently used are dropped)
+
+            Cached arrays are read-only and cached tables are returned as copies. The cache is cleared automatically
+            whenever the data changes.
+        """
+        self.query_cache = QueryCache(maxsize)
+
+    def disable_query_cache(self):
+        self.query_cache = None
+
+    def get_query_cache_info(self) -> CacheInfo:
+        """ Returns hits, misses, maxsize, current size and hit rate of the query cache, None if it is disabled """
+        if self.query_cache is not None:
+            return self.query_cache.info()
+
+    def attach_registry(self, registry, name: str):
+        """ Register the available country codes in a CountryRegistry and store the registry id of every row
+
+            :arg
+                | registry (CountryRegistry): registry shared between data sets
+                | name (str): name under which the data set is registered
+            :returns
+                | None
+            :raises
+                No exceptions raised.
+        """
+        registry.register(name, self.available_country_codes)
+        self.registry = registry
+        self.registry_name = name
+        # Registry id of the country code of each row in self.data, -1 if the country code is not available
+        self.registry_ids = np.where(self.data['Country Code'].isin(self.available_country_codes),
+                                     registry.get_ids(self.data['Country Code']), -1)
+
     def load_data(self) -> pd.DataFrame:
         """ Data loading function
 
@@ -25,6 +261,22 @@ class WorldDataHandler:
         """
         return None
 
+    def load_column_titles(self) -> list:
+        """ Read the column titles of the source file without loading any rows
+
+            OVERWRITE FOR SPECIFIC DATASET
+
+        """
+        return list()
+
+    def load_columns(self, columns: list) -> pd.DataFrame:
+        """ Load the given columns of the source file, without any post-processing of load_data
+
+            OVERWRITE FOR SPECIFIC DATASET
+
+        """
+        return None
+
     def create_country_code_list(self) -> list:
         """ Create a list of abbreviated country identifiers
 
@@ -61,12 +313,12 @@ class WorldDataHandler:
             :arg
                 | country_code (str): three letter country code
             ::return
-                | (pd.DataFrame): DataFrame row matching the sought country code
+                | (pd.DataFrame): DataFrame row matching the sought country code (table of the storage backend)
             :raises
                 No exceptions raised.
         """
         if self.check_country_code_availability(country_code):
-            return self.data.loc[self.data['Country Code'] == country_code]
+            return self.backend.filter_equal(self.table, 'Country Code', country_code)
 
     def extract_year_from_column(self, column: str) -> int:
         """ Function detects whether or not given column title is a year indicator. Must return the year as an integer
@@ -97,16 +349,72 @@ class WorldDataHandler:
             Raises:
                 No exceptions raised.
         """
-        value = info[column].values[0]
-        if value == '..':
+        value = self.backend.get_first_value(info, column)
+        if value == '..' or value is None:
             value = np.nan
         else:
             value = float(value)
         return value
 
+    def get_year_columns(self) -> dict[int]:
+        """ Returns a dict with all columns of self.data containing yearly values as keys and their years as values """
+        year_columns = {}
+        for column in self.data.columns:
+            year = self.extract_year_from_column(column)
+            if year:
+                year_columns[column] = year
+        return year_columns
+
+    def create_value_matrix(self, info: pd.DataFrame) -> pd.DataFrame:
+        """ Convert rows of the dataset into a (country x year) matrix of floats
+
+            Rows with country codes that are not available are dropped, as are repeated country codes. Missing values
+            ('..' or other non-numeric entries) are converted to NaN.
+
+            :arg
+                | info (pd.DataFrame): subsection of the data (table of the storage backend)
+            :returns
+                | (pd.DataFrame): index is 'Country Code', columns are years (int)
+            :raises
+                No exceptions raised.
+        """
+        return self.backend.pivot_years(info, self.get_year_columns(), self.available_country_codes)
+
+    def create_value_cube(self, key_columns: list[str]) -> (list[tuple], list[str], np.ndarray, np.ndarray):
+        """ Convert the complete dataset into a (key x country x year) array of floats in one vectorized pass
+
+            As in create_value_matrix, only the first row of a repeated (key, country code) combination is kept.
+            Ignored country codes (e.g. 'XXX' for unmatched IEA names) are dropped.
+
+            :arg
+                | key_columns (list[str]): columns identifying a time series besides the country code, e.g.
+                                           ['Series Name'] or ['Flow', 'Product']
+            :returns
+                | (list[tuple]): sorted keys, each a tuple of key_columns values
+                | (list[str]): sorted available country codes
+                | (np.ndarray): years
+                | (np.ndarray): values of shape (keys, country codes, years), NaN where values are missing
+            :raises
+                No exceptions raised.
+        """
+        year_columns = self.get_year_columns()
+        country_codes = [code for code in dict.fromkeys(self.available_country_codes)
+                         if code not in ignored_country_codes]
+        rows, values = self.backend.extract_values(self.backend.filter_isin(self.table, 'Country Code', country_codes),
+                                                   key_columns + ['Country Code'], list(year_columns.keys()))
+
+        key_ids, keys = pd.factorize(pd.MultiIndex.from_frame(rows[key_columns]), sort=True)
+        country_ids, country_codes = pd.factorize(rows['Country Code'], sort=True)
+
+        # Keep the first row of every (key, country code) combination
+        _, first_rows = np.unique(key_ids * len(country_codes) + country_ids, return_index=True)
+        cube = np.full((len(keys), len(country_codes), len(year_columns)), np.nan)
+        cube[key_ids[first_rows], country_ids[first_rows]] = values[first_rows]
+        return list(keys), list(country_codes), np.array(list(year_columns.values())), cube
+
     def create_time_series_for_info(self, info: pd.DataFrame) -> (np.ndarray, np.ndarray):
         years, values = [], []
-        for column in info.columns:
+        for column in self.backend.get_columns(info):
             year = self.extract_year_from_column(column)
             if year:
                 years.append(year)
@@ -118,8 +426,10 @@ class WorldDataHandler:
 class GDPDataHandler(WorldDataHandler):
     """ Parent class for dealing with GDP datasets """
 
-    def __init__(self, filepath):
-        super().__init__(filepath)
+    encoding = 'ansi'
+
+    def __init__(self, filepath, backend='pandas'):
+        super().__init__(filepath, backend=backend)
         self.additional_initialization()
 
     def create_country_code_list(self):
@@ -144,18 +454,93 @@ class GDPDataHandler(WorldDataHandler):
             :raises
                 No exceptions raised.
         """
-        return pd.read_csv(self.filepath, sep='\t+', engine='python', encoding='ansi')
+        return self.strip_series_name_quotes(pd.read_csv(self.filepath, sep='\t+', engine='python',
+                                                         encoding=self.encoding))
 
+    @staticmethod
+    def strip_series_name_quotes(df: pd.DataFrame) -> pd.DataFrame:
+        """ Series names containing commas are quoted in World Bank exports. The regex separator of read_csv keeps the
+            quotes, which are removed so that series can be queried by their plain names.
+        """
+        if 'Series Name' in df.columns:
+            df['Series Name'] = df['Series Name'].str.strip('"')
+        return df
+
+    def load_column_titles(self) -> list:
+        """ Overwrites the parent class function. """
+        return list(pd.read_csv(self.filepath, sep='\t+', engine='python', encoding=self.encoding, nrows=0).columns)
+
+    def load_columns(self, columns: list) -> pd.DataFrame:
+        """ Overwrites the parent class function. """
+        positions = [idx for idx, column in enumerate(self.load_column_titles()) if column in columns]
+        return self.strip_series_name_quotes(pd.read_csv(self.filepath, sep='\t+', engine='python',
+                                                         encoding=self.encoding, usecols=positions))
+
+    @cached_query
     def create_timeseries_for_country_by_series_name(self, country_code: str, series_name: str):
         return self.create_time_series_for_info(self.get_info_by_series_name(country_code, series_name))
 
     def get_info_by_series_name(self, country_code: str, series_name: str):
-        info = self.get_info(country_code)
-        return info.loc[info['Series Name'] == series_name]
+        return self.backend.filter_equal(self.get_info(country_code), 'Series Name', series_name)
 
     def get_info_by_series_code(self, country_code: str, series_code: str):
-        info = self.get_info(country_code)
-        return info.loc[info['Series Code'] == series_code]
+        return self.backend.filter_equal(self.get_info(country_code), 'Series Code', series_code)
+
+    def get_series_cube(self, series: list[str], country_codes: list[str] = None, years: (int, int) = None,
+                        by='Series Name') -> SeriesCube:
+        """ Query several series for several countries and years in one vectorized selection
+
+            :arg
+                | series (list[str]): series names or series codes, determines the order of the first axis
+                | country_codes (list[str]): 3-digit country codes, all available country codes if None
+                | years ((int, int)): first and last year (inclusive), all years if None
+                | by (str): 'Series Name' or 'Series Code', the column series refers to
+            :returns
+                | (SeriesCube): values of shape (series, country codes, years), NaN where values are missing, and the
+                                labels along each axis. Repeated series or country codes are repeated along their axis.
+            :raises
+                ValueError: is raised if by is neither 'Series Name' nor 'Series Code'.
+                KeyError: is raised if a series or country code is not available.
+        """
+        if by not in ['Series Name', 'Series Code']:
+            raise ValueError(f'{by} is not recognized, select series by either Series Name or Series Code.')
+        available_series = self.data[by].unique()
+        for series_label in series:
+            if series_label not in available_series:
+                raise KeyError(f'{series_label} is not recognized as an available {by}.')
+        if country_codes is None:
+            country_codes = list(dict.fromkeys(self.available_country_codes))
+        else:
+            for country_code in country_codes:
+                self.check_country_code_availability(country_code)
+
+        year_columns = self.get_year_columns()
+        if years is not None:
+            year_columns = {column: year for column, year in year_columns.items() if years[0] <= year <= years[1]}
+
+        # Select all requested rows at once and place them according to their series and country code. Repeated labels
+        # are resolved on the unique labels and mapped back, repeated rows keep the first row as in create_value_matrix
+        unique_series, unique_country_codes = pd.Index(series).unique(), pd.Index(country_codes).unique()
+        table = self.backend.filter_isin(self.backend.filter_isin(self.table, by, list(unique_series)),
+                                         'Country Code', list(unique_country_codes))
+        rows, values = self.backend.extract_values(table, [by, 'Country Code'], list(year_columns.keys()))
+        series_ids = unique_series.get_indexer(rows[by])
+        country_ids = unique_country_codes.get_indexer(rows['Country Code'])
+        _, first_rows = np.unique(series_ids * len(unique_country_codes) + country_ids, return_index=True)
+
+        cube = np.full((len(unique_series), len(unique_country_codes), len(year_columns)), np.nan)
+        cube[series_ids[first_rows], country_ids[first_rows]] = values[first_rows]
+        cube = cube[np.ix_(unique_series.get_indexer(series), unique_country_codes.get_indexer(country_codes))]
+        return SeriesCube(cube, list(series), list(country_codes), np.array(list(year_columns.values()), dtype=int))
+
+    def create_matrix_by_series_name(self, series_name: str) -> pd.DataFrame:
+        """ Returns a (country x year) matrix of values for a given series name """
+        return self.create_value_matrix(self.backend.filter_equal(self.table, 'Series Name', series_name))
+
+    def create_series_cube(self) -> (list[str], list[str], np.ndarray, np.ndarray):
+        """ Wrapper for create_value_cube returning a (series name x country x year) array """
+        keys, country_codes, years, cube = self.create_value_cube(['Series Name'])
+        return [key[0] for key in keys], country_codes, years, cube
 
 
 class GDPMetadata(GDPDataHandler):
@@ -164,6 +549,22 @@ class GDPMetadata(GDPDataHandler):
     def additional_initialization(self):
         # Create a list of all available regions
         self.regions = self.get_regions()
+        self.income_groups = self.get_income_groups()
+
+        # Lookup of the region for each country code
+        self.region_dict = dict(zip(self.available_country_codes, self.data['Region']))
+
+        # Membership of each available country code in regions and income groups
+        self.region_ids = self.create_membership_ids('Region', self.regions)
+        self.region_masks = self.create_membership_masks(self.region_ids, self.regions)
+        self.income_group_ids = self.create_membership_ids('Income Group', self.income_groups)
+        self.income_group_masks = self.create_membership_masks(self.income_group_ids, self.income_groups)
+
+    def invalidate(self, rows_changed: bool):
+        """ Overwrites the parent class function. Regions are rebuilt alongside the country lists """
+        super().invalidate(rows_changed)
+        if rows_changed:
+            self.additional_initialization()
 
     def get_regions(self):
         """ Returns a list of all available regions, filtering out non-geographic descriptors (i.e. World, etc.)
@@ -171,33 +572,42 @@ class GDPMetadata(GDPDataHandler):
             :arg
                 | None
             :return
-                | (np.ndarray): array of strings for unique regions
+                | (list): list of strings for unique regions
+            :raises
+                No exceptions raised.
+        """
+        regions = pd.Series(self.data['Region'].dropna().unique())
+        # A region is part of a continental region if it contains any of the descriptors, i.e. Middle East, Africa, Asia
+        is_continental_region = regions.str.contains('|'.join(re.escape(nam) for nam in self.continent_descriptors))
+        return regions.loc[is_continental_region].to_list()
+
+    def get_income_groups(self) -> list[str]:
+        """ Returns a list of all income groups assigned to countries within the continental regions """
+        is_country = self.data['Region'].isin(self.regions)
+        return self.data.loc[is_country, 'Income Group'].dropna().unique().tolist()
+
+    def create_membership_ids(self, column: str, labels: list[str]) -> np.ndarray:
+        """ Returns the index of the label in labels for each available country code, -1 if the label is not listed
+
+            :arg
+                | column (str): column of the metadata holding the group labels, e.g. 'Region'
+                | labels (list[str]): group labels to consider
+            :returns
+                | (np.ndarray): integer array aligned with self.available_country_codes
             :raises
                 No exceptions raised.
         """
-        def is_continental_region(region: str) -> bool:
-            """ True if region is part of a continental region, i.e. Middle East, Africa, Asia
-
-                :arg
-                    | region (str): name of a region
-                :returns
-                    | (bool): True if region is part of a continental region
-                :raises
-                    No exceptions raised.
-            """
-            is_geographic_region = False
-            for region_nam in self.continent_descriptors:
-                if region:
-                    if region_nam in region:
-                        is_geographic_region = True
-                        break
-            return is_geographic_region
-
-        return [region for region in self.data['Region'].unique() if is_continental_region(region)]
+        return pd.Index(labels).get_indexer(self.data[column])
+
+    @staticmethod
+    def create_membership_masks(membership_ids: np.ndarray, labels: list[str]) -> np.ndarray:
+        """ Returns a boolean (group x country) mask from the membership ids created via create_membership_ids """
+        return membership_ids[np.newaxis, :] == np.arange(len(labels))[:, np.newaxis]
 
+    @cached_query
     def get_long_name(self, country_code: str) -> str:
         """ Returns the long name for a given country code """
-        return self.get_info(country_code)['Long Name'].values[0]
+        return self.backend.get_first_value(self.get_info(country_code), 'Long Name')
 
     def get_country_code(self, long_name: str) -> str:
         """ Returns the country code for a given long name """
@@ -205,8 +615,10 @@ class GDPMetadata(GDPDataHandler):
             idx = np.argwhere(self.data['Country Name'].to_numpy() == long_name)[0][0]
             return self.available_country_codes[idx]
 
+    @cached_query
     def get_region(self, country_code: str):
-        return self.get_info(country_code)['Region'].values[0]
+        if self.check_country_code_availability(country_code):
+            return self.region_dict[country_code]
 
     def match_colloquial_long_name(self, colloquial_name: str, verbose=True):
         """ Returns an official name for a colloquially used country name
@@ -242,7 +654,8 @@ class GDPMetadata(GDPDataHandler):
 class GDPData(GDPDataHandler):
     def load_data(self):
         """ Overwrites the parent class function. """
-        return pd.read_csv(self.filepath, sep='\t+', engine='python', encoding='ansi')
+        return self.strip_series_name_quotes(pd.read_csv(self.filepath, sep='\t+', engine='python',
+                                                         encoding=self.encoding))
 
     def extract_year_from_column(self, column: str) -> int:
         """ Overwrites the parent class function.
@@ -261,17 +674,36 @@ class GDPData(GDPDataHandler):
 class IEAData(WorldDataHandler):
     """ For handling International Energy Agency data """
 
-    def __init__(self, filepath, long_name_interpreter):
-        """ Overwrites the default __init__ function"""
+    derived_columns = ['Country Code']
+
+    def __init__(self, filepath, long_name_interpreter, backend='pandas', sheet_name='TimeSeries_1971-2021',
+                 dependency_filepaths: list[str] = ()):
+        """ Overwrites the default __init__ function. The sheet name changes with each edition of the data set """
         self.long_name_interpreter = long_name_interpreter
-        super().__init__(filepath)
+        self.sheet_name = sheet_name
+        super().__init__(filepath, backend=backend, dependency_filepaths=dependency_filepaths)
+
+    def __getstate__(self) -> dict:
+        """ Overwrites the parent class function. The long_name_interpreter is a closure and has to be re-attached """
+        state = super().__getstate__()
+        state['long_name_interpreter'] = None
+        return state
 
     def load_data(self) -> pd.DataFrame:
         """ Overwrites the default load_data function """
-        df = pd.read_excel(self.filepath, 'TimeSeries_1971-2021', skiprows=[0])
+        df = pd.read_excel(self.filepath, self.sheet_name, skiprows=[0])
         df['Country Code'] = [self.long_name_interpreter(long_name, verbose=False) for long_name in df['Country']]
         return df
 
+    def load_column_titles(self) -> list:
+        """ Overwrites the parent class function. """
+        return list(pd.read_excel(self.filepath, self.sheet_name, skiprows=[0], nrows=0).columns)
+
+    def load_columns(self, columns: list) -> pd.DataFrame:
+        """ Overwrites the parent class function. Columns are selected by position, as year titles are integers """
+        positions = [idx for idx, column in enumerate(self.load_column_titles()) if column in columns]
+        return pd.read_excel(self.filepath, self.sheet_name, skiprows=[0], usecols=positions)
+
     def filter_long_name_list(self, long_name_list: list[str]) -> list[str]:
         """ Removes any non-physical regions considered in the IEA dataset """
         filtered_list = []
@@ -315,23 +747,31 @@ class IEAData(WorldDataHandler):
         if self.check_country_code_availability(country_code):
             return self.country_code_dict[country_code]
 
-    @staticmethod
-    def get_flow_rows(info: pd.DataFrame, flow: str) -> pd.DataFrame:
-        return info.loc[info['Flow'] == flow]
+    def get_flow_rows(self, info: pd.DataFrame, flow: str) -> pd.DataFrame:
+        return self.backend.filter_equal(info, 'Flow', flow)
 
-    @staticmethod
-    def get_product_rows(info: pd.DataFrame, product: str) -> pd.DataFrame:
-        return info.loc[info['Product'] == product]
+    def get_product_rows(self, info: pd.DataFrame, product: str) -> pd.DataFrame:
+        return self.backend.filter_equal(info, 'Product', product)
 
     def get_product_and_flow_rows(self, info: pd.DataFrame, product: str, flow: str) -> pd.DataFrame:
         return self.get_flow_rows(self.get_product_rows(info, product), flow)
 
+    @cached_query
     def get_product_and_flow_rows_for_country(self, country_code: str, product: str, flow: str) -> pd.DataFrame:
         return self.get_product_and_flow_rows(self.get_info(country_code), product, flow)
 
+    @cached_query
     def get_electricity_output(self, country_code: str) -> pd.DataFrame:
         return self.get_flow_rows(self.get_info(country_code), 'Electricity output (GWh)')
 
+    def create_matrix_for_product_and_flow(self, product: str, flow: str) -> pd.DataFrame:
+        """ Returns a (country x year) matrix of values for a given product and flow """
+        return self.create_value_matrix(self.get_product_and_flow_rows(self.table, product, flow))
+
+    def create_flow_and_product_cube(self) -> (list[tuple], list[str], np.ndarray, np.ndarray):
+        """ Wrapper for create_value_cube returning a ((flow, product) x country x year) array """
+        return self.create_value_cube(['Flow', 'Product'])
+
     def extract_year_from_column(self, column) -> int:
         """ Overwrites the parent class function.
 
@@ -1,7 +1,8 @@
 import numpy as np
 from functools import reduce
 
-from .data_classes import IEAData, GDPData
+from .data_classes import IEAData, GDPData, GDPMetadata
+from .registry import CountryRegistry
 
 
 def create_energy_dict(flows: list[str], products: list[str],
@@ -64,15 +65,8 @@ def create_gdp_dict(gdp_variables: list[str],
         :raises
             No exceptions raised.
     """
-    gdp_dict = {gdp_variable: [] for gdp_variable in gdp_variables}
-
-    for gdp_variable in gdp_variables:
-        for country_code in country_codes:
-            years, vals = gdp.create_timeseries_for_country_by_series_name(country_code, gdp_variable)
-            gdp_dict[gdp_variable].extend(vals[years == plot_year])
-        gdp_dict[gdp_variable] = np.array(gdp_dict[gdp_variable])
-
-    return gdp_dict
+    series_cube = gdp.get_series_cube(gdp_variables, country_codes, years=(plot_year, plot_year))
+    return {gdp_variable: series_cube.values[idx].ravel() for idx, gdp_variable in enumerate(gdp_variables)}
 
 
 def create_colloquial_name_list(country_codes: list[str], iea: IEAData) -> list[str]:
@@ -85,14 +79,45 @@ def determine_common_values(array_list: list[list]) -> list:
     return reduce(np.intersect1d, array_list).tolist()
 
 
+def get_country_registry(gdp: GDPData, nrg_data: IEAData, gdp_md: GDPMetadata = None) -> CountryRegistry:
+    """ Returns the CountryRegistry shared by the provided data sets, creating a new one if gdp has none
+
+        Data sets not yet attached to the registry are registered into it. Existing ids are never changed, country
+        codes of data sets registered later are appended.
+
+        :arg
+            | gdp (GDPData): GDP data set, registered as 'gdp'
+            | nrg_data (IEAData): energy data set, registered as 'nrg_data'
+            | gdp_md (GDPMetadata): optional GDP metadata set, registered as 'gdp_md'
+        :returns
+            | (CountryRegistry): registry with the coverage of all provided data sets
+        :raises
+            No exceptions raised.
+    """
+    handlers = {'gdp': gdp, 'nrg_data': nrg_data}
+    if gdp_md is not None:
+        handlers['gdp_md'] = gdp_md
+
+    registry = gdp.registry
+    if registry is None:
+        registry = CountryRegistry()
+        # Register all codes in sorted order first, so that ids follow the alphabetical order of the country codes
+        registry.add_country_codes(sorted(set().union(*[handler.available_country_codes
+                                                        for handler in handlers.values()])))
+    for name, handler in handlers.items():
+        if handler.registry is not registry:
+            handler.attach_registry(registry, name)
+    return registry
+
+
 def find_all_available_country_codes(gdp: GDPData, nrg_data: IEAData) -> list[str]:
     """ Returns all available country codes that are present both provided data sets"""
-    return determine_common_values([gdp.available_country_codes, nrg_data.available_country_codes])
+    registry = get_country_registry(gdp, nrg_data)
+    return sorted(registry.get_country_codes(registry.get_coverage_mask(['gdp', 'nrg_data'])))
 
 
 def find_all_available_country_codes_and_sanitize(gdp: GDPData, nrg_data: IEAData) -> list[str]:
     """ Returns all available country codes that are present both provided data sets, minus the WORLD code """
-    country_codes = determine_common_values([gdp.available_country_codes, nrg_data.available_country_codes])
-    country_codes.remove('WLD')
-    return country_codes
-
+    registry = get_country_registry(gdp, nrg_data)
+    mask = registry.get_coverage_mask(['gdp', 'nrg_data']) & ~registry.create_code_mask(['WLD'])
+    return sorted(registry.get_country_codes(mask))
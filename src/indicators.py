@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+
+from .data_classes import GDPData, IEAData, DerivedData, get_derived_data
+
+# Flows and product groups used by the derived indicators
+ELECTRICITY_FLOW = 'Electricity output (GWh)'
+SUPPLY_FLOW = 'Total energy supply (PJ)'
+GDP_PER_CAPITA = 'GDP per capita (constant 2015 US$)'
+
+supply_product_groups = {'fossil': ['Natural gas', 'Oil products', 'Coal, peat and oil shale',
+                                    'Crude, NGL and feedstocks'],
+                         'nuclear': ['Nuclear'],
+                         'heat': ['Heat'],
+                         'electricity': ['Electricity'],
+                         'renewable': ['Renewables and waste']}
+
+# Registry of all derived indicators: name -> (function, description)
+indicator_definitions = {}
+
+
+def indicator(name: str, description: str):
+    """ Decorator to register a derived indicator
+
+        The decorated function takes an IndicatorEngine as its only argument and returns a (country x year)
+        pd.DataFrame. Other indicators and raw inputs must be requested via the engine so they are memoized.
+
+        :arg
+            | name (str): name under which the indicator is evaluated
+            | description (str): short description including the unit of the indicator
+        :returns
+            | (function): decorator registering the function
+        :raises
+            No exceptions raised.
+    """
+    def register(function):
+        indicator_definitions[name] = (function, description)
+        return function
+    return register
+
+
+class IndicatorEngine(DerivedData):
+    """ Evaluates derived indicators for every country and year at once and memoizes the results
+
+        Results are (country x year) pd.DataFrames with 'Country Code' as index and years as columns. The memoized
+        results are dropped automatically when the data of either data set changes.
+    """
+
+    def __init__(self, gdp: GDPData, nrg_data: IEAData):
+        super().__init__(gdp, nrg_data)
+        self.gdp = gdp
+        self.nrg_data = nrg_data
+        self.cache = {}
+
+    def check_data_versions(self):
+        """ Clear the memoized results if any of the data sets changed since they were computed """
+        if self.is_outdated():
+            self.cache = {}
+            self.data_versions = self.get_data_versions()
+
+    def memoize(self, key: tuple, function) -> pd.DataFrame:
+        self.check_data_versions()
+        if key not in self.cache:
+            self.cache[key] = function()
+        return self.cache[key]
+
+    def iea(self, flow: str, product: str) -> pd.DataFrame:
+        """ Returns the (country x year) matrix for a flow/product combination of the IEA data set """
+        return self.memoize(('iea', flow, product),
+                            lambda: self.nrg_data.create_matrix_for_product_and_flow(product, flow))
+
+    def iea_sum(self, flow: str, products: list[str]) -> pd.DataFrame:
+        """ Returns the sum of the (country x year) matrices of several products for a given flow """
+        return self.memoize(('iea_sum', flow, tuple(products)),
+                            lambda: sum(self.iea(flow, product) for product in products))
+
+    def gdp_series(self, series_name: str) -> pd.DataFrame:
+        """ Returns the (country x year) matrix for a series of the GDP data set """
+        return self.memoize(('gdp', series_name), lambda: self.gdp.create_matrix_by_series_name(series_name))
+
+    def evaluate(self, name: str) -> pd.DataFrame:
+        """ Evaluate a registered indicator for all countries and years
+
+            :arg
+                | name (str): name of the indicator, see indicator_definitions
+            :returns
+                | (pd.DataFrame): (country x year) matrix of the indicator
+            :raises
+                KeyError: is raised if no indicator is registered under the given name.
+        """
+        if name not in indicator_definitions:
+            raise KeyError(f'{name} is not recognized as a derived indicator.')
+        function, _ = indicator_definitions[name]
+        return self.memoize(('indicator', name), lambda: function(self))
+
+    def get_values(self, name: str, country_codes: list[str], year: int) -> np.ndarray:
+        """ Returns the values of an indicator for a list of countries in a given year, NaN where unavailable """
+        matrix = self.evaluate(name)
+        return matrix.reindex(index=country_codes, columns=[year])[year].to_numpy()
+
+
+def get_indicator_engine(gdp: GDPData, nrg_data: IEAData) -> IndicatorEngine:
+    """ Returns the IndicatorEngine for a pair of data sets, creating it on first use so that results are shared """
+    return get_derived_data(nrg_data, 'indicator_engine', IndicatorEngine, gdp, nrg_data)
+
+
+def list_indicators() -> dict[str]:
+    """ Returns a dict of all registered indicators and their descriptions """
+    return {name: description for name, (_, description) in indicator_definitions.items()}
+
+
+# ELECTRICITY
+# ----------------------------------------------------------------------------------------------------------------------
+@indicator('electricity_total', 'Total electricity output (GWh)')
+def electricity_total(engine: IndicatorEngine) -> pd.DataFrame:
+    return engine.iea(ELECTRICITY_FLOW, 'Total')
+
+
+def electricity_share(engine: IndicatorEngine, product: str) -> pd.DataFrame:
+    return 100 * engine.iea(ELECTRICITY_FLOW, product) / engine.iea(ELECTRICITY_FLOW, 'Total')
+
+
+@indicator('electricity_fossil_share', 'Fossil fuel fraction of electricity output (%)')
+def electricity_fossil_share(engine: IndicatorEngine) -> pd.DataFrame:
+    return electricity_share(engine, 'Fossil fuels')
+
+
+@indicator('electricity_nuclear_share', 'Nuclear fraction of electricity output (%)')
+def electricity_nuclear_share(engine: IndicatorEngine) -> pd.DataFrame:
+    return electricity_share(engine, 'Nuclear')
+
+
+@indicator('electricity_renewable_share', 'Renewable fraction of electricity output (%)')
+def electricity_renewable_share(engine: IndicatorEngine) -> pd.DataFrame:
+    return electricity_share(engine, 'Renewable sources')
+
+
+# TOTAL ENERGY SUPPLY
+# ----------------------------------------------------------------------------------------------------------------------
+@indicator('supply_total', 'Total energy supply (PJ)')
+def supply_total(engine: IndicatorEngine) -> pd.DataFrame:
+    return engine.iea(SUPPLY_FLOW, 'Total')
+
+
+@indicator('supply_export_adjusted_total', 'Total energy supply plus net electricity exports (PJ)')
+def supply_export_adjusted_total(engine: IndicatorEngine) -> pd.DataFrame:
+    # Negative net electricity supply is predominantly exported, but still counted towards a countries generation.
+    # Missing electricity values leave the total unchanged.
+    total = engine.evaluate('supply_total')
+    electricity = engine.iea_sum(SUPPLY_FLOW, supply_product_groups['electricity'])
+    adjusted = total.sub(electricity.clip(upper=0), fill_value=0).reindex_like(total)
+    return adjusted.where(total.notna())
+
+
+@indicator('supply_export_adjusted_total_thousands', 'Total energy supply plus net electricity exports (1000s of PJ)')
+def supply_export_adjusted_total_thousands(engine: IndicatorEngine) -> pd.DataFrame:
+    return engine.evaluate('supply_export_adjusted_total') / 1e3
+
+
+def supply_fraction(engine: IndicatorEngine, group: str) -> pd.DataFrame:
+    return engine.iea_sum(SUPPLY_FLOW, supply_product_groups[group]) / engine.evaluate('supply_export_adjusted_total')
+
+
+@indicator('supply_fossil_fraction', 'Fossil fraction of the export-adjusted energy supply')
+def supply_fossil_fraction(engine: IndicatorEngine) -> pd.DataFrame:
+    return supply_fraction(engine, 'fossil')
+
+
+@indicator('supply_nuclear_fraction', 'Nuclear fraction of the export-adjusted energy supply')
+def supply_nuclear_fraction(engine: IndicatorEngine) -> pd.DataFrame:
+    return supply_fraction(engine, 'nuclear')
+
+
+@indicator('supply_renewable_fraction', 'Renewable & waste fraction of the export-adjusted energy supply')
+def supply_renewable_fraction(engine: IndicatorEngine) -> pd.DataFrame:
+    return supply_fraction(engine, 'renewable')
+
+
+@indicator('supply_other_fraction', 'Fraction of the export-adjusted energy supply not covered by fossil, nuclear or '
+                                    'renewable sources (heat, imported electricity, etc.)')
+def supply_other_fraction(engine: IndicatorEngine) -> pd.DataFrame:
+    fractions = [engine.evaluate(f'supply_{group}_fraction') for group in ['fossil', 'nuclear', 'renewable']]
+    return (1 - sum(fractions)).clip(lower=0)
+
+
+@indicator('supply_renewable_share', 'Renewable & waste percentage of the export-adjusted energy supply (%)')
+def supply_renewable_share(engine: IndicatorEngine) -> pd.DataFrame:
+    return 100 * engine.evaluate('supply_renewable_fraction')
+
+
+@indicator('supply_renewable_thousands', 'Renewable & waste energy supply (1000s of PJ)')
+def supply_renewable_thousands(engine: IndicatorEngine) -> pd.DataFrame:
+    return engine.iea_sum(SUPPLY_FLOW, supply_product_groups['renewable']) / 1e3
+
+
+# ECONOMIC
+# ----------------------------------------------------------------------------------------------------------------------
+@indicator('gdp_per_capita', 'GDP per capita (constant 2015 US$)')
+def gdp_per_capita(engine: IndicatorEngine) -> pd.DataFrame:
+    return engine.gdp_series(GDP_PER_CAPITA)
+
+
+@indicator('gdp_per_capita_thousands', 'GDP per capita (1000s of constant 2015 US$)')
+def gdp_per_capita_thousands(engine: IndicatorEngine) -> pd.DataFrame:
+    return engine.evaluate('gdp_per_capita') / 1e3
+
+
+@indicator('energy_use_per_capita', 'Energy use per capita (kg of oil equivalent)')
+def energy_use_per_capita(engine: IndicatorEngine) -> pd.DataFrame:
+    # The World Bank data provides GDP per unit of energy use, dividing GDP per capita (in the same units) yields the
+    # energy use per capita
+    gdp_ppp = engine.gdp_series('GDP per capita, PPP (constant 2017 international $)')
+    gdp_per_energy = engine.gdp_series('GDP per unit of energy use (constant 2017 PPP $ per kg of oil equivalent)')
+    return gdp_ppp / gdp_per_energy
@@ -2,6 +2,9 @@ import os
 import pandas as pd
 from .data_classes import GDPMetadata
 
+# Colloquial country names the parser functions can not handle, mapped to their official names
+edge_cases_filepath = os.path.join(os.path.dirname(__file__), '..', 'data', 'country_name_edge_cases.txt')
+
 
 def build_long_name_interpreter(parser_func, edge_cases: dict[str]):
     """ Builds a long_name_interpreter given an interpreting function and edge cases the interpreting function can not handle
@@ -52,8 +55,7 @@ def build_GDPMetadata_parser_func(metadata: GDPMetadata):
     """
 
     def load_edge_cases():
-        filepath = os.path.join(os.path.dirname(__file__), '..', 'data', 'country_name_edge_cases.txt')
-        return pd.read_csv(filepath, sep='\t+', engine='python', header=0, index_col=0).to_dict()['Official Name']
+        return pd.read_csv(edge_cases_filepath, sep='\t+', engine='python', header=0, index_col=0).to_dict()['Official Name']
 
     def parser_func(long_name, verbose):
         return metadata.get_country_code(metadata.match_colloquial_long_name(long_name, verbose))
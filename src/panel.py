@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from .data_classes import GDPData, GDPMetadata, IEAData, DerivedData, get_derived_data
+from .data_preparation import get_country_registry
+from .indicators import get_indicator_engine, list_indicators
+
+
+class Panel(DerivedData):
+    """ Tidy (country, year)-indexed table joining GDPData, GDPMetadata and IEAData
+
+        Descriptive columns are 'Country' (colloquial IEA name), 'Region' and 'Income Group'. All other columns are
+        the derived indicators of src.indicators, named as in list_indicators(). The panel is built once for all
+        countries and years and sliced by the plot functions. Data sets are joined on the ids of their shared
+        CountryRegistry, rows follow the order of the ids.
+    """
+
+    descriptive_columns = ['Country', 'Region', 'Income Group']
+
+    def __init__(self, gdp: GDPData, gdp_md: GDPMetadata, nrg_data: IEAData, indicator_names: list[str] = None):
+        super().__init__(gdp, gdp_md, nrg_data)
+        if indicator_names is None:
+            indicator_names = list(list_indicators().keys())
+        self.indicator_names = indicator_names
+        self.data = self.build(gdp, gdp_md, nrg_data)
+
+    def build(self, gdp: GDPData, gdp_md: GDPMetadata, nrg_data: IEAData) -> pd.DataFrame:
+        """ Join all data sets into a single (country, year)-indexed pd.DataFrame
+
+            :arg
+                | gdp (GDPData): GDP data set
+                | gdp_md (GDPMetadata): GDP metadata set
+                | nrg_data (IEAData): energy data set
+            :returns
+                | (pd.DataFrame): MultiIndex ('Country Code', 'Year'), one row for each combination of country code
+                                  available in both gdp and nrg_data and year
+            :raises
+                No exceptions raised.
+        """
+        engine = get_indicator_engine(gdp, nrg_data)
+        matrices = {name: engine.evaluate(name) for name in self.indicator_names}
+
+        registry = get_country_registry(gdp, nrg_data, gdp_md)
+        mask = registry.get_coverage_mask(['gdp', 'nrg_data'])
+        ids = np.flatnonzero(mask)
+        years = sorted(set().union(*[matrix.columns for matrix in matrices.values()]))
+        index = pd.MultiIndex.from_product([registry.get_country_codes(mask), years], names=['Country Code', 'Year'])
+
+        # Descriptive columns are constant across years
+        descriptions = {'Country': registry.align_values(registry.get_ids(list(nrg_data.country_code_dict.keys())),
+                                                         list(nrg_data.country_code_dict.values())),
+                        'Region': registry.align_values(gdp_md.registry_ids, gdp_md.data['Region']),
+                        'Income Group': registry.align_values(gdp_md.registry_ids, gdp_md.data['Income Group'])}
+        columns = {}
+        for column, description in descriptions.items():
+            columns[column] = np.repeat(description[ids], len(years))
+        for name, matrix in matrices.items():
+            columns[name] = registry.align(matrix.reindex(columns=years))[ids].ravel()
+
+        return pd.DataFrame(columns, index=index)
+
+    def select(self, year: int, country_codes: list[str]) -> pd.DataFrame:
+        """ Returns the panel rows for a given year and list of countries
+
+            :arg
+                | year (int): year to select
+                | country_codes (list[str]): list of 3-digit country codes, determines the order of the rows
+            :returns
+                | (pd.DataFrame): index is 'Country Code', NaN for countries or years not covered by the panel
+            :raises
+                No exceptions raised.
+        """
+        index = pd.MultiIndex.from_product([country_codes, [year]], names=['Country Code', 'Year'])
+        return self.data.reindex(index).droplevel('Year')
+
+
+def get_panel(gdp: GDPData, gdp_md: GDPMetadata, nrg_data: IEAData) -> Panel:
+    """ Returns the Panel for the provided data sets, building it on first use or after any of the data sets changed """
+    return get_derived_data(nrg_data, 'panel', Panel, gdp, gdp_md, nrg_data)
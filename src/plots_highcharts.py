@@ -1,6 +1,6 @@
-from . import data_preparation as data_prep
 from . import plots_tools
 from .data_classes import GDPData, GDPMetadata, IEAData
+from .panel import get_panel
 
 from highcharts_core.chart import Chart
 from highcharts_core.options import HighchartsOptions
@@ -97,33 +97,23 @@ def total_energy_supply_plot(plot_year: int, plot_country_codes: list[str], gdp:
     # DATA PREPARATION
     # ------------------------------------------------------------------------------------------------------------------
 
-    # List of all countries that are to be included in the plot
-    colloquial_names = data_prep.create_colloquial_name_list(plot_country_codes, nrg_data)
-
-    # Gross-Domestic Product (GDP) data
-    gdp_variable = 'GDP per capita (constant 2015 US$)'
-    gdp_list = data_prep.create_gdp_dict([gdp_variable], plot_country_codes, plot_year, gdp)[gdp_variable]
-
-    # Energy data
-    flows = ['Total energy supply (PJ)']
-    products = ['Total',
-                'Renewables and waste',
-                'Nuclear',
-                'Heat',
-                'Electricity',
-                'Natural gas',
-                'Oil products',
-                'Coal, peat and oil shale',
-                'Crude, NGL and feedstocks']
-
-    energy_dict = data_prep.create_energy_dict(flows, products, plot_country_codes, plot_year, nrg_data)[flows[0]]
-
-    # Group the different product streams into larger categories
-    fossil_products = ['Natural gas', 'Oil products', 'Coal, peat and oil shale', 'Crude, NGL and feedstocks']
-    nuclear_products = ['Nuclear']
-    heat_products = ['Heat']
-    elec_products = ['Electricity']
-    renew_products = ['Renewables and waste']
+    # Gross-Domestic Product (GDP) and energy data for all countries that are to be included in the plot, the panel is
+    # shared between plots
+    plot_data = get_panel(gdp, gdp_md, nrg_data).select(plot_year, plot_country_codes)
+    colloquial_names = plot_data['Country'].to_list()
+    region_list = plot_data['Region'].to_list()
+
+    def get_values(indicator_name: str) -> np.ndarray:
+        return plot_data[indicator_name].to_numpy()
+
+    gdp_list = get_values('gdp_per_capita_thousands')
+    total_list = get_values('supply_export_adjusted_total_thousands')
+    renew_share_list = get_values('supply_renewable_share')
+    renew_deployed_list = get_values('supply_renewable_thousands')
+    fraction_lists = {'Fossil': get_values('supply_fossil_fraction'),
+                      'Nuclear': get_values('supply_nuclear_fraction'),
+                      'Renewable & waste': get_values('supply_renewable_fraction'),
+                      'Other (Heat, imported electricity, etc.)': get_values('supply_other_fraction')}
 
     # Create the regional data lists
 
@@ -141,39 +131,25 @@ def total_energy_supply_plot(plot_year: int, plot_country_codes: list[str], gdp:
             graph_str += f' {value * 100:.1f}% {key}' + new_line
         return graph_str
 
-    data_lists_separated_by_region = {region: [] for region in gdp_md.get_regions()}
+    data_lists_separated_by_region = {region: [] for region in gdp_md.regions}
     for idx, country_code in enumerate(plot_country_codes):
         # Determine contribution of each product
-        fossil, nuclear, heat, elec, renew = [np.sum([energy_dict[var_nam][idx] for var_nam in pl]) for pl in
-                                              [fossil_products, nuclear_products, heat_products, elec_products,
-                                               renew_products]]
-
-        # Total energy supply minus the net electricity supply if it is negative (predominantly exports, still counted towards
-        # a countries generation)
-        # -> secondary source, does not contribute to overall supply
-        total = energy_dict['Total'][idx]
-        # Add exported energy to a countries tally
-        if elec < 0:
-            total -= elec
-
-        info_dict = {'Fossil': fossil / total,
-                     'Nuclear': nuclear / total,
-                     'Renewable & waste': renew / total,
-                     'Other (Heat, imported electricity, etc.)': np.clip(total - fossil - nuclear - renew) / total}
+        info_dict = {key: fraction_list[idx] for key, fraction_list in fraction_lists.items()}
 
-        custom_data_dict = {'mix_string': create_graph_string('Energy mix', info_dict), 'renew_deployed': renew / 1e3}
+        custom_data_dict = {'mix_string': create_graph_string('Energy mix', info_dict),
+                            'renew_deployed': renew_deployed_list[idx]}
 
         # Determine the region
-        region = gdp_md.get_region(country_code)
+        region = region_list[idx]
 
         data_lists_separated_by_region[region].append({
             'name': colloquial_names[idx],
             'countryCode': country_code,
             'country': colloquial_names[idx],
             'region': region,
-            'x': gdp_list[idx] / 1e3,
-            'y': 100 * renew / total,
-            'z': total / 1e3,
+            'x': gdp_list[idx],
+            'y': renew_share_list[idx],
+            'z': total_list[idx],
             'color': plots_tools.get_color_based_on_region(region),
             'custom': custom_data_dict,
         })
@@ -1,5 +1,5 @@
-from . import data_preparation as data_prep
 from .data_classes import GDPData, GDPMetadata, IEAData
+from .panel import get_panel
 
 import numpy as np
 import pandas as pd
@@ -62,10 +62,10 @@ def electricity_plot(plot_year: int, plot_country_codes: list[str], gdp: GDPData
     # DATA PREPARATION
     # ------------------------------------------------------------------------------------------------------------------
 
-    colloquial_names = data_prep.create_colloquial_name_list(plot_country_codes, nrg_data)
-    gdp_variable = 'GDP per capita (constant 2015 US$)'
-    gdp_list = data_prep.create_gdp_dict([gdp_variable], plot_country_codes, plot_year, gdp)[gdp_variable]
-    electricity_lists = data_prep.create_electricity_dict(plot_country_codes, plot_year, nrg_data)
+    plot_data = get_panel(gdp, gdp_md, nrg_data).select(plot_year, plot_country_codes)
+    colloquial_names = plot_data['Country'].to_list()
+    gdp_list = plot_data['gdp_per_capita'].to_numpy()
+    electricity_total = plot_data['electricity_total'].to_numpy()
 
     # PLOTTING
     # ------------------------------------------------------------------------------------------------------------------
@@ -80,14 +80,16 @@ def electricity_plot(plot_year: int, plot_country_codes: list[str], gdp: GDPData
     cols = {'Code': plot_country_codes,
             'Country': colloquial_names,
             'GDP per capita (2015 US$)': gdp_list,
-            'Total electricity consumption (GWh)': electricity_lists['Total'],
-            'Size': 80 * electricity_lists['Total'] / np.max(electricity_lists['Total']),
-            'Region': [gdp_md.get_region(country_code) for country_code in plot_country_codes],
+            'Total electricity consumption (GWh)': electricity_total,
+            'Size': 80 * electricity_total / np.nanmax(electricity_total),
+            'Region': plot_data['Region'].to_list(),
             'label_text': [name if (elec > elec_cutoff and name not in exclude_list) or name in include_list else '' for
-                           name, elec in zip(colloquial_names, electricity_lists['Total'])]}
+                           name, elec in zip(colloquial_names, electricity_total)]}
 
-    for key in ['Nuclear', 'Fossil fuels', 'Renewable sources']:
-        cols |= {f'{key} fraction (%)': 100 * electricity_lists[key] / electricity_lists['Total']}
+    for key, indicator_name in [('Nuclear', 'electricity_nuclear_share'),
+                                ('Fossil fuels', 'electricity_fossil_share'),
+                                ('Renewable sources', 'electricity_renewable_share')]:
+        cols |= {f'{key} fraction (%)': plot_data[indicator_name].to_numpy()}
 
     cols['Energy mix'] = [tooltip_function(nuclear, renewable, fossil) for nuclear, renewable, fossil in
                           zip(cols['Nuclear fraction (%)'], cols['Renewable sources fraction (%)'],
@@ -0,0 +1,113 @@
+import functools
+import inspect
+import numpy as np
+import pandas as pd
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize', 'hit_rate'])
+
+
+class QueryCache:
+    """ Size-bounded (LRU) cache for the results of handler query methods
+
+        Entries are tied to the data_version of the handler and dropped as soon as it changes. Cached results can not
+        be corrupted by callers: arrays are stored read-only and tables are handed out as copies.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.data_version = None
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict:
+        """ Cached entries and statistics are not pickled (e.g. for snapshots), only the configuration """
+        return {'maxsize': self.maxsize}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def get(self, key: tuple, data_version: int, function):
+        """ Returns the cached result for key, calling function to compute it if it is not cached
+
+            :arg
+                | key (tuple): hashable key identifying the query
+                | data_version (int): data_version of the handler, all entries are dropped if it changed
+                | function (function): computes the result without arguments
+            :returns
+                | result of function, see protect_result
+            :raises
+                No exceptions raised.
+        """
+        if data_version != self.data_version:
+            self.entries.clear()
+            self.data_version = data_version
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        else:
+            self.misses += 1
+            self.entries[key] = freeze_result(function())
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return protect_result(self.entries[key])
+
+    def clear(self):
+        self.entries.clear()
+
+    def info(self) -> CacheInfo:
+        """ Returns hit and miss counts, size and hit rate of the cache """
+        calls = self.hits + self.misses
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries),
+                         self.hits / calls if calls > 0 else 0.)
+
+
+def freeze_result(result):
+    """ Make arrays (also within tuples) read-only before they are stored in the cache """
+    if isinstance(result, np.ndarray):
+        result = result.copy()
+        result.flags.writeable = False
+    elif isinstance(result, tuple):
+        result = tuple(freeze_result(item) for item in result)
+    return result
+
+
+def protect_result(result):
+    """ Hand out copies of cached tables, which can not be made read-only """
+    if isinstance(result, pd.DataFrame):
+        return result.copy()
+    if hasattr(result, 'clone'):
+        # polars.DataFrame, cloning does not copy the underlying data
+        return result.clone()
+    return result
+
+
+def is_hashable(key: tuple) -> bool:
+    try:
+        hash(key)
+    except TypeError:
+        return False
+    return True
+
+
+def cached_query(method):
+    """ Decorator routing a handler query method through the handler's query cache, if enabled
+
+        Arguments are bound to the signature of the method, so positional and keyword calls share a cache entry.
+        Calls with unhashable arguments (e.g. lists) bypass the cache.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.query_cache is None:
+            return method(self, *args, **kwargs)
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(bound.arguments.items())[1:]
+        if not is_hashable(key):
+            return method(self, *args, **kwargs)
+        return self.query_cache.get(key, self.data_version, lambda: method(self, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# Country codes that do not identify a country, i.e. the code returned by long_name_interpreter if no match is found
+ignored_country_codes = ['XXX']
+
+
+class CountryRegistry:
+    """ Assigns a stable integer id to every three letter country code and records which data sets cover it
+
+        Ids are never reassigned: country codes registered later are appended. Arrays indexed by id allow joins between
+        data sets via array indexing and filtering via boolean masks.
+    """
+
+    def __init__(self):
+        self.country_codes = []
+        self.index = pd.Index([], dtype=object)
+        self.coverage = {}
+
+    def __len__(self):
+        return len(self.country_codes)
+
+    def add_country_codes(self, country_codes: list[str]) -> np.ndarray:
+        """ Add country codes that are not yet registered and return the ids of all given country codes
+
+            :arg
+                | country_codes (list[str]): three letter country codes
+            :returns
+                | (np.ndarray): integer ids of the country codes, -1 for ignored country codes
+            :raises
+                No exceptions raised.
+        """
+        new_codes = pd.Index(country_codes).unique().difference(self.index, sort=True)
+        new_codes = new_codes.drop(ignored_country_codes, errors='ignore')
+        if len(new_codes) > 0:
+            self.country_codes.extend(new_codes.to_list())
+            self.index = pd.Index(self.country_codes, dtype=object)
+            # Pad the coverage masks of all registered data sets to the new length
+            for name, mask in self.coverage.items():
+                self.coverage[name] = np.concatenate([mask, np.zeros(len(new_codes), dtype=bool)])
+        return self.get_ids(country_codes)
+
+    def get_ids(self, country_codes: list[str]) -> np.ndarray:
+        """ Returns the integer ids of the given country codes, -1 for unregistered country codes """
+        return self.index.get_indexer(pd.Index(country_codes, dtype=object))
+
+    def get_country_codes(self, mask: np.ndarray = None) -> list[str]:
+        """ Returns the registered country codes, optionally filtered by a boolean mask over all ids """
+        if mask is None:
+            return list(self.country_codes)
+        return self.index[np.asarray(mask, dtype=bool)].to_list()
+
+    def register(self, name: str, country_codes: list[str]) -> np.ndarray:
+        """ Register the country codes covered by a data set, replacing any previous coverage of that data set
+
+            :arg
+                | name (str): name of the data set
+                | country_codes (list[str]): all country codes available in the data set
+            :returns
+                | (np.ndarray): integer ids of the country codes, -1 for ignored country codes
+            :raises
+                No exceptions raised.
+        """
+        ids = self.add_country_codes(country_codes)
+        mask = np.zeros(len(self), dtype=bool)
+        mask[ids[ids >= 0]] = True
+        self.coverage[name] = mask
+        return ids
+
+    def get_coverage_mask(self, names: list[str]) -> np.ndarray:
+        """ Returns a boolean mask over all ids, True for country codes covered by all given data sets
+
+            :raises
+                KeyError: is raised if a data set has not been registered.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name in names:
+            if name not in self.coverage:
+                raise KeyError(f'{name} is not recognized as a registered data set.')
+            mask &= self.coverage[name]
+        return mask
+
+    def create_code_mask(self, country_codes: list[str]) -> np.ndarray:
+        """ Returns a boolean mask over all ids, True for the given country codes (e.g. aggregates such as 'WLD') """
+        ids = self.get_ids(country_codes)
+        mask = np.zeros(len(self), dtype=bool)
+        mask[ids[ids >= 0]] = True
+        return mask
+
+    def create_region_mask(self, regions: dict[str], valid_regions: list[str]) -> np.ndarray:
+        """ Returns a boolean mask over all ids, True for country codes with a region listed in valid_regions
+
+            :arg
+                | regions (dict[str]): region for each country code, e.g. GDPMetadata.region_dict
+                | valid_regions (list[str]): regions to consider, e.g. GDPMetadata.regions
+            :returns
+                | (np.ndarray): boolean mask, False for aggregates (World, income groups, etc.) and unknown codes
+            :raises
+                No exceptions raised.
+        """
+        region_list = pd.Series(regions).reindex(self.country_codes)
+        return region_list.isin(valid_regions).to_numpy()
+
+    def align_values(self, ids: np.ndarray, values: list) -> np.ndarray:
+        """ Returns per-row values (e.g. a column of a data set) as an object array indexed by registry id
+
+            :arg
+                | ids (np.ndarray): registry id of each row, -1 for rows to skip, e.g. WorldDataHandler.registry_ids
+                | values (list): value of each row
+            :returns
+                | (np.ndarray): array of length len(registry), the first row wins for repeated ids, NaN for ids
+                                without a row
+            :raises
+                No exceptions raised.
+        """
+        unique_ids, first_rows = np.unique(np.asarray(ids), return_index=True)
+        first_rows = first_rows[unique_ids >= 0]
+        aligned = np.full(len(self), np.nan, dtype=object)
+        aligned[unique_ids[unique_ids >= 0]] = np.asarray(values, dtype=object)[first_rows]
+        return aligned
+
+    def align(self, matrix: pd.DataFrame) -> np.ndarray:
+        """ Returns the values of a (country x year) matrix as an array aligned to the registry ids
+
+            :arg
+                | matrix (pd.DataFrame): index is 'Country Code', e.g. from WorldDataHandler.create_value_matrix
+            :returns
+                | (np.ndarray): array of shape (len(registry), number of columns), NaN for uncovered country codes
+            :raises
+                No exceptions raised.
+        """
+        aligned = np.full((len(self), matrix.shape[1]), np.nan)
+        ids = self.get_ids(matrix.index)
+        aligned[ids[ids >= 0]] = matrix.to_numpy(dtype=float)[ids >= 0]
+        return aligned
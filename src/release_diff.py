@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from .data_classes import WorldDataHandler, GDPData, IEAData
+
+statuses = ['revised', 'added', 'removed']
+
+
+def align_cube(keys: list[tuple], country_codes: list[str], years: np.ndarray, values: np.ndarray,
+               all_keys: pd.MultiIndex, all_country_codes: pd.Index, all_years: np.ndarray) -> np.ndarray:
+    """ Place a (key x country x year) array created via create_value_cube onto a common set of labels, NaN elsewhere """
+    aligned = np.full((len(all_keys), len(all_country_codes), len(all_years)), np.nan)
+    aligned[np.ix_(all_keys.get_indexer(pd.MultiIndex.from_tuples(keys)),
+                   all_country_codes.get_indexer(country_codes),
+                   np.searchsorted(all_years, years))] = values
+    return aligned
+
+
+def compare_releases(old: WorldDataHandler, new: WorldDataHandler, key_columns: list[str],
+                     rtol=1e-6, atol=0.) -> pd.DataFrame:
+    """ Compare two editions of a data set, aligned on (key, country code, year)
+
+        :arg
+            | old (WorldDataHandler): previous edition of the data set
+            | new (WorldDataHandler): new edition of the data set
+            | key_columns (list[str]): columns identifying a time series besides the country code, e.g. ['Series Code']
+                                       or ['Flow', 'Product']
+            | rtol (float): relative tolerance below which changed values are not considered a revision
+            | atol (float): absolute tolerance below which changed values are not considered a revision
+        :returns
+            | (pd.DataFrame): one row per revised, added or removed value with the columns key_columns, 'Country Code',
+                              'Year', 'Old', 'New', 'Change' and 'Status' ('revised', 'added' or 'removed')
+        :raises
+            No exceptions raised.
+    """
+    old_cube, new_cube = old.create_value_cube(key_columns), new.create_value_cube(key_columns)
+
+    all_keys = pd.MultiIndex.from_tuples(sorted(set(old_cube[0]).union(new_cube[0])), names=key_columns)
+    all_country_codes = pd.Index(sorted(set(old_cube[1]).union(new_cube[1])), dtype=object)
+    all_years = np.array(sorted(set(old_cube[2]).union(new_cube[2])))
+
+    old_values = align_cube(*old_cube, all_keys, all_country_codes, all_years)
+    new_values = align_cube(*new_cube, all_keys, all_country_codes, all_years)
+
+    old_valid, new_valid = np.isfinite(old_values), np.isfinite(new_values)
+    flags = {'revised': old_valid & new_valid & ~np.isclose(new_values, old_values, rtol=rtol, atol=atol),
+             'added': ~old_valid & new_valid,
+             'removed': old_valid & ~new_valid}
+
+    tables = []
+    for status in statuses:
+        key_ids, country_ids, year_ids = np.nonzero(flags[status])
+        table = all_keys[key_ids].to_frame(index=False)
+        table['Country Code'] = all_country_codes[country_ids]
+        table['Year'] = all_years[year_ids]
+        table['Old'] = old_values[key_ids, country_ids, year_ids]
+        table['New'] = new_values[key_ids, country_ids, year_ids]
+        table['Change'] = table['New'] - table['Old']
+        table['Status'] = status
+        tables.append(table)
+    return pd.concat(tables, ignore_index=True)
+
+
+def summarize_revisions(revisions: pd.DataFrame, key_columns: list[str]) -> pd.DataFrame:
+    """ Count revised, added and removed values for each key of a table created via compare_releases """
+    summary = revisions.groupby(key_columns + ['Status']).size().unstack('Status', fill_value=0)
+    return summary.reindex(columns=statuses, fill_value=0)
+
+
+def compare_gdp_releases(old_filepath: str, new_filepath: str, rtol=1e-6, atol=0.) -> pd.DataFrame:
+    """ Wrapper for compare_releases loading two World Bank exports, aligned on the series code """
+    return compare_releases(GDPData(old_filepath), GDPData(new_filepath), ['Series Code'], rtol=rtol, atol=atol)
+
+
+def compare_iea_releases(old_filepath: str, new_filepath: str, long_name_interpreter,
+                         old_sheet_name='TimeSeries_1971-2021', new_sheet_name='TimeSeries_1971-2021',
+                         rtol=1e-6, atol=0.) -> pd.DataFrame:
+    """ Wrapper for compare_releases loading two editions of the IEA data, aligned on flow and product
+
+        :arg
+            | old_filepath (str): path of the previous edition
+            | new_filepath (str): path of the new edition
+            | long_name_interpreter (function): see src.interpreters.build_long_name_interpreter
+            | old_sheet_name (str): sheet holding the time series in the previous edition
+            | new_sheet_name (str): sheet holding the time series in the new edition
+            | rtol, atol (float): tolerances, see compare_releases
+        :returns
+            | (pd.DataFrame): see compare_releases
+        :raises
+            No exceptions raised.
+    """
+    old = IEAData(old_filepath, long_name_interpreter, sheet_name=old_sheet_name)
+    new = IEAData(new_filepath, long_name_interpreter, sheet_name=new_sheet_name)
+    return compare_releases(old, new, ['Flow', 'Product'], rtol=rtol, atol=atol)
@@ -0,0 +1,96 @@
+import os
+import pickle
+import tempfile
+
+from . import interpreters as interp
+from .data_classes import GDPData, GDPMetadata, IEAData, create_file_fingerprint
+
+# Increment whenever the state of the data handlers changes in an incompatible way
+snapshot_version = 2
+
+
+def save_snapshot(filepath: str, gdp: GDPData, gdp_md: GDPMetadata, nrg_data: IEAData):
+    """ Write the fully initialized state of all data handlers into a single binary bundle
+
+        The bundle starts with a header holding the snapshot version and the fingerprints of all source and dependency
+        files (e.g. the country name edge cases), followed by the pickled handlers (data, country code lists, name
+        maps, regions, masks and registry). The bundle is written to a temporary file first and moved into place, so
+        concurrent readers never see a partially written bundle.
+
+        :arg
+            | filepath (str): path of the bundle
+            | gdp (GDPData): GDP data set
+            | gdp_md (GDPMetadata): GDP metadata set
+            | nrg_data (IEAData): energy data set
+        :returns
+            | None
+        :raises
+            No exceptions raised.
+    """
+    handlers = (gdp, gdp_md, nrg_data)
+    fingerprints = [(handler.filepath, handler.fingerprint) for handler in handlers]
+    for handler in handlers:
+        fingerprints.extend(handler.dependency_fingerprints.items())
+    header = {'version': snapshot_version, 'fingerprints': fingerprints}
+
+    file_descriptor, temporary_filepath = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filepath)),
+                                                           suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(handlers, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_filepath, filepath)
+    except BaseException:
+        os.remove(temporary_filepath)
+        raise
+
+
+def read_snapshot_header(filepath: str) -> dict:
+    """ Returns the header of a bundle without reading the handlers """
+    with open(filepath, 'rb') as file:
+        return pickle.load(file)
+
+
+def is_snapshot_valid(header: dict) -> bool:
+    """ True if the snapshot version matches and none of the source files have changed since the bundle was written """
+    if not isinstance(header, dict) or header.get('version') != snapshot_version:
+        return False
+    for filepath, fingerprint in header.get('fingerprints', []):
+        try:
+            if create_file_fingerprint(filepath) != fingerprint:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def load_snapshot(filepath: str) -> (GDPData, GDPMetadata, IEAData):
+    """ Restore all data handlers from a bundle written via save_snapshot
+
+        :arg
+            | filepath (str): path of the bundle
+        :returns
+            | (GDPData, GDPMetadata, IEAData): data handlers behaving the same as freshly built ones
+        :raises
+            ValueError: is raised if the bundle can not be read (truncated, corrupted or written by incompatible
+                        classes), the snapshot version is outdated or any source file has changed.
+    """
+    with open(filepath, 'rb') as file:
+        # Unpickling can fail in many ways (EOFError, UnpicklingError, AttributeError, ModuleNotFoundError, ...), all
+        # of which mean the bundle has to be rebuilt
+        try:
+            header = pickle.load(file)
+        except Exception as error:
+            raise ValueError(f'{filepath} is not recognized as a snapshot.') from error
+        if not is_snapshot_valid(header):
+            raise ValueError(f'Snapshot {filepath} is outdated and has to be rebuilt.')
+        try:
+            gdp, gdp_md, nrg_data = pickle.load(file)
+        except Exception as error:
+            raise ValueError(f'Snapshot {filepath} is corrupted and has to be rebuilt.') from error
+
+    # The name interpreter is a closure and can not be stored, it only depends on the metadata
+    parser_func, edge_cases = interp.build_GDPMetadata_parser_func(gdp_md)
+    nrg_data.long_name_interpreter = interp.build_long_name_interpreter(parser_func, edge_cases)
+
+    return gdp, gdp_md, nrg_data
@@ -0,0 +1,156 @@
+import numpy as np
+import time
+
+from .data_classes import WorldDataHandler
+
+# All kernels operate along the last axis (years) of arrays of arbitrary shape, e.g. the (key x country x year) arrays
+# created via WorldDataHandler.create_value_cube. Missing values are NaN.
+
+
+def growth_rate(values: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """ Annualized growth rate (%) between consecutive years
+
+        :arg
+            | values (np.ndarray): array with years along the last axis
+            | years (np.ndarray): years matching the last axis of values, gaps between years are annualized
+        :returns
+            | (np.ndarray): array of the same shape as values, NaN for the first year and wherever a value is missing
+        :raises
+            No exceptions raised.
+    """
+    rates = np.full(values.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = values[..., 1:] / values[..., :-1]
+        rates[..., 1:] = 100 * (np.power(ratio, 1 / np.diff(years)) - 1)
+    return rates
+
+
+def cagr(values: np.ndarray, years: np.ndarray, start_year: int, end_year: int) -> np.ndarray:
+    """ Compound annual growth rate (%) between two years
+
+        :arg
+            | values (np.ndarray): array with years along the last axis
+            | years (np.ndarray): years matching the last axis of values
+            | start_year (int): first year of the period
+            | end_year (int): last year of the period
+        :returns
+            | (np.ndarray): array of the shape of values without the last axis, NaN if either value is missing
+        :raises
+            ValueError: is raised if either year is not available.
+    """
+    if start_year not in years or end_year not in years:
+        raise ValueError(f'{start_year} and {end_year} have to be within the available years.')
+    start, end = np.argmax(years == start_year), np.argmax(years == end_year)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 * (np.power(values[..., end] / values[..., start], 1 / (end_year - start_year)) - 1)
+
+
+def rolling_mean(values: np.ndarray, years: np.ndarray, window: int, min_periods: int = 1) -> np.ndarray:
+    """ Rolling mean over the last window years along the year axis, ignoring missing values
+
+        :arg
+            | values (np.ndarray): array with years along the last axis
+            | years (np.ndarray): ascending years matching the last axis of values, may contain gaps
+            | window (int): number of years to average over, including the current one. For year y the values of all
+                            years within (y - window, y] are averaged.
+            | min_periods (int): minimum number of available values within the window, otherwise NaN is returned
+        :returns
+            | (np.ndarray): array of the same shape as values
+        :raises
+            No exceptions raised.
+    """
+    valid = np.isfinite(values)
+    padding = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    cumulative_sum = np.pad(np.cumsum(np.where(valid, values, 0), axis=-1), padding)
+    cumulative_count = np.pad(np.cumsum(valid, axis=-1), padding)
+
+    # Position of the cumulative value preceding the window of each entry, i.e. the number of years before the window
+    window_start = np.searchsorted(years, np.asarray(years) - window, side='right')
+    window_sum = cumulative_sum[..., 1:] - cumulative_sum[..., window_start]
+    window_count = cumulative_count[..., 1:] - cumulative_count[..., window_start]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(window_count >= max(min_periods, 1), window_sum / window_count, np.nan)
+
+
+def interpolate_gaps(values: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """ Linearly interpolate missing values ('..' entries) between the first and last available value
+
+        :arg
+            | values (np.ndarray): array with years along the last axis
+            | years (np.ndarray): years matching the last axis of values, used as interpolation coordinates
+        :returns
+            | (np.ndarray): array of the same shape as values, leading and trailing gaps remain NaN
+        :raises
+            No exceptions raised.
+    """
+    valid = np.isfinite(values)
+    n_years = values.shape[-1]
+    positions = np.broadcast_to(np.arange(n_years), values.shape)
+
+    # Position of the previous and next available value for every entry
+    previous_idx = np.maximum.accumulate(np.where(valid, positions, -1), axis=-1)
+    next_idx = np.flip(np.minimum.accumulate(np.flip(np.where(valid, positions, n_years), axis=-1), axis=-1), axis=-1)
+    is_gap = ~valid & (previous_idx >= 0) & (next_idx < n_years)
+
+    previous_idx, next_idx = np.clip(previous_idx, 0, n_years - 1), np.clip(next_idx, 0, n_years - 1)
+    previous_values = np.take_along_axis(values, previous_idx, axis=-1)
+    next_values = np.take_along_axis(values, next_idx, axis=-1)
+    previous_years, next_years = years[previous_idx], years[next_idx]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = (years - previous_years) / (next_years - previous_years)
+        interpolated = previous_values + weight * (next_values - previous_values)
+    return np.where(is_gap, interpolated, values)
+
+
+def first_valid_year(values: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """ First year with an available value, NaN if no value is available """
+    valid = np.isfinite(values)
+    return np.where(valid.any(axis=-1), years[np.argmax(valid, axis=-1)], np.nan)
+
+
+def last_valid_year(values: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """ Last year with an available value, NaN if no value is available """
+    valid = np.flip(np.isfinite(values), axis=-1)
+    return np.where(valid.any(axis=-1), np.flip(years)[np.argmax(valid, axis=-1)], np.nan)
+
+
+def benchmark_kernels(values: np.ndarray, years: np.ndarray, window=3, verbose=True) -> dict[dict[float]]:
+    """ Run all kernels on the full array and report their throughput
+
+        :arg
+            | values (np.ndarray): array with years along the last axis, e.g. from create_value_cube
+            | years (np.ndarray): years matching the last axis of values
+            | window (int): window (years) used for rolling_mean
+            | verbose (bool): if True prints the throughput of each kernel
+        :returns
+            | (dict[dict[float]]): runtime ('seconds') and throughput ('cells_per_second') for each kernel
+        :raises
+            No exceptions raised.
+    """
+    kernels = {'growth_rate': lambda: growth_rate(values, years),
+               'cagr': lambda: cagr(values, years, years[0], years[-1]),
+               'rolling_mean': lambda: rolling_mean(values, years, window),
+               'interpolate_gaps': lambda: interpolate_gaps(values, years),
+               'first_valid_year': lambda: first_valid_year(values, years),
+               'last_valid_year': lambda: last_valid_year(values, years)}
+
+    results = {}
+    for name, kernel in kernels.items():
+        start = time.perf_counter()
+        kernel()
+        seconds = time.perf_counter() - start
+        results[name] = {'seconds': seconds, 'cells_per_second': values.size / seconds if seconds > 0 else np.inf}
+        if verbose:
+            print(f'{name:<20} {seconds * 1e3:>10.2f} ms {results[name]["cells_per_second"] / 1e6:>10.1f} M cells/s')
+    return results
+
+
+def benchmark_handler(handler: WorldDataHandler, key_columns: list[str], window=3, verbose=True) -> dict[dict[float]]:
+    """ Wrapper for benchmark_kernels running all kernels on the complete dataset of a handler """
+    _, _, years, values = handler.create_value_cube(key_columns)
+    if verbose:
+        print(f'{type(handler).__name__}: {values.shape[0]} series x {values.shape[1]} countries x '
+              f'{values.shape[2]} years')
+    return benchmark_kernels(values, years, window=window, verbose=verbose)
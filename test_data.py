@@ -0,0 +1,370 @@
+from . import load_data
+from .src.data_classes import GDPData, GDPMetadata
+from .src import interpreters as interp
+from .src import snapshot
+from .src import timeseries
+from .src.cross_section import weighted_fit
+from .src.release_diff import compare_releases, summarize_revisions
+from .src.indicators import IndicatorEngine
+from .src.query_cache import QueryCache, cached_query
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Tests run on small synthetic files in the format of a World Bank export, written to pytest's tmp_path
+
+SERIES_NAME = 'GDP per capita (constant 2015 US$)'
+SERIES_CODE = 'NY.GDP.PCAP.KD'
+DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), 'data')
+
+
+class SyntheticGDPData(GDPData):
+    """ GDPData reading UTF-8 files (the synthetic files and the ASCII sample data) on every platform """
+    encoding = 'utf-8'
+
+
+class SampleGDPMetadata(GDPMetadata):
+    """ GDPMetadata reading the Windows-1252 encoded sample metadata on every platform """
+    encoding = 'cp1252'
+
+
+def write_gdp_file(filepath, years: list[int], country_codes=('AAA', 'BBB', 'CCC'), values: dict = None,
+                   series=((SERIES_NAME, SERIES_CODE),)):
+    """ Write a World Bank export with one row per (series, country), the value of each (country, year) is
+        100000 * series idx + 1000 * country idx + year unless given in values, a dict of (country code, year): value
+        ('..' for missing values) applied to all series
+    """
+    values = values or {}
+    frames = []
+    for series_idx, (series_name, series_code) in enumerate(series):
+        df = pd.DataFrame({'Series Name': series_name,
+                           'Series Code': series_code,
+                           'Country Name': [f'Country {code}' for code in country_codes],
+                           'Country Code': list(country_codes)})
+        for year in years:
+            df[f'{year} [YR{year}]'] = [str(values.get((code, year), 100000. * series_idx + 1000. * idx + year))
+                                        for idx, code in enumerate(country_codes)]
+        frames.append(df)
+    pd.concat(frames, ignore_index=True).to_csv(filepath, sep='\t', index=False, encoding='utf-8')
+
+
+def test_refresh_unchanged(tmp_path):
+    """ Refreshing an unchanged file keeps the data and its version """
+    filepath = tmp_path / 'gdp.txt'
+    write_gdp_file(filepath, [2000, 2001])
+    gdp = SyntheticGDPData(filepath)
+
+    assert gdp.refresh() == 'unchanged'
+    assert gdp.data_version == 0
+
+
+def test_refresh_appended(tmp_path):
+    """ New year columns are appended, country lists are kept and queries see the new year """
+    filepath = tmp_path / 'gdp.txt'
+    write_gdp_file(filepath, [2000, 2001], values={('BBB', 2001): '..'})
+    gdp = SyntheticGDPData(filepath)
+    country_codes = gdp.available_country_codes
+
+    write_gdp_file(filepath, [2000, 2001, 2013], values={('BBB', 2001): '..'})
+    assert gdp.refresh() == 'appended'
+    assert gdp.data_version == 1
+    assert gdp.available_country_codes is country_codes
+    assert list(gdp.get_year_columns().values()) == [2000, 2001, 2013]
+
+    years, values = gdp.create_timeseries_for_country_by_series_name('BBB', SERIES_NAME)
+    np.testing.assert_array_equal(years, [2000, 2001, 2013])
+    np.testing.assert_array_equal(values, [3000., np.nan, 3013.])
+    assert gdp.refresh() == 'unchanged'
+
+
+def test_refresh_reloaded(tmp_path):
+    """ Added rows or changed values without new year columns require a full reload """
+    filepath = tmp_path / 'gdp.txt'
+    write_gdp_file(filepath, [2000, 2001])
+    gdp = SyntheticGDPData(filepath)
+
+    write_gdp_file(filepath, [2000, 2001, 2002], country_codes=('AAA', 'BBB', 'CCC', 'DDD'))
+    assert gdp.refresh() == 'reloaded'
+    assert gdp.available_country_codes == ['AAA', 'BBB', 'CCC', 'DDD']
+
+    write_gdp_file(filepath, [2000, 2001, 2002], country_codes=('AAA', 'BBB', 'CCC', 'DDD'),
+                   values={('AAA', 2000): 1.5})
+    assert gdp.refresh() == 'reloaded'
+    assert gdp.data_version == 2
+    assert gdp.create_timeseries_for_country_by_series_name('AAA', SERIES_NAME)[1][0] == 1.5
+
+    # A new year alongside a revised value of an earlier year is not a plain append
+    write_gdp_file(filepath, [2000, 2001, 2002, 2003], country_codes=('AAA', 'BBB', 'CCC', 'DDD'),
+                   values={('AAA', 2000): 5.})
+    assert gdp.refresh() == 'reloaded'
+    assert gdp.create_timeseries_for_country_by_series_name('AAA', SERIES_NAME)[1][0] == 5.
+    assert gdp.data.equals(SyntheticGDPData(filepath).data)
+
+
+def test_interpolate_gaps():
+    """ Interior gaps are interpolated on the (irregular) years, leading/trailing gaps and empty rows stay NaN """
+    years = np.array([1990, 2000, 2013, 2014, 2015, 2016])
+    values = np.array([[np.nan, 10., np.nan, np.nan, 16., np.nan],
+                       [np.nan, np.nan, np.nan, np.nan, np.nan, np.nan],
+                       [1., 2., 3., 4., 5., 6.]])
+
+    interpolated = timeseries.interpolate_gaps(values, years)
+    np.testing.assert_allclose(interpolated[0], [np.nan, 10., 15.2, 15.6, 16., np.nan])
+    assert np.isnan(interpolated[1]).all()
+    np.testing.assert_array_equal(interpolated[2], values[2])
+
+
+def test_growth_rate():
+    """ Growth rates are annualized over year gaps, NaN for the first year and next to missing values """
+    years = np.array([2000, 2001, 2003, 2004, 2005])
+    values = np.array([100., 110., 133.1, np.nan, 150.])
+
+    rates = timeseries.growth_rate(values, years)
+    np.testing.assert_allclose(rates, [np.nan, 10., 10., np.nan, np.nan])
+    np.testing.assert_allclose(timeseries.cagr(values, years, 2000, 2003), 10.)
+
+
+def test_rolling_mean_spans_years():
+    """ Windows span years, not array entries, and ignore missing values """
+    years = np.array([1990, 2000, 2013, 2014, 2015])
+    values = np.array([1., 2., 3., np.nan, 5.])
+
+    np.testing.assert_allclose(timeseries.rolling_mean(values, years, 3), [1., 2., 3., 3., 4.])
+    np.testing.assert_allclose(timeseries.rolling_mean(values, years, 3, min_periods=2),
+                               [np.nan, np.nan, np.nan, np.nan, 4.])
+
+
+def test_weighted_fit_matches_polyfit():
+    """ The weighted fit matches np.polyfit (which weights residuals, i.e. by sqrt of the weights), missing entries
+        and zero weights are excluded, fewer than three countries return NaN
+    """
+    rng = np.random.default_rng(0)
+    x, weights = rng.normal(size=(20, 1)), rng.uniform(0.5, 2., size=(20, 1))
+    y = 1.5 + 3. * x + rng.normal(scale=0.5, size=(20, 1))
+    x[3], weights[5] = np.nan, 0.
+    valid = np.isfinite(x[:, 0]) & (weights[:, 0] > 0)
+
+    fit = weighted_fit(x, y, weights)
+    slope, intercept = np.polyfit(x[valid, 0], y[valid, 0], 1, w=np.sqrt(weights[valid, 0]))
+    np.testing.assert_allclose(fit['slope'], [slope])
+    np.testing.assert_allclose(fit['intercept'], [intercept])
+    assert fit['n'][0] == valid.sum()
+
+    finite = np.isfinite(x[:, 0])
+    unweighted = weighted_fit(x, y, np.ones_like(x))
+    np.testing.assert_allclose(unweighted['r'], [np.corrcoef(x[finite, 0], y[finite, 0])[0, 1]])
+
+    too_few = weighted_fit(x[:2], y[:2], weights[:2])
+    assert np.isnan(too_few['r']).all() and np.isnan(too_few['slope']).all()
+
+
+def test_compare_releases_tolerances(tmp_path):
+    """ Changes within the tolerances are not flagged, added years and removed countries are """
+    write_gdp_file(tmp_path / 'old.txt', [2000, 2001], values={('AAA', 2000): 100., ('BBB', 2000): 100.})
+    write_gdp_file(tmp_path / 'new.txt', [2000, 2001, 2002], country_codes=('AAA', 'BBB'),
+                   values={('AAA', 2000): 100.00001, ('BBB', 2000): 101.})
+    old, new = SyntheticGDPData(tmp_path / 'old.txt'), SyntheticGDPData(tmp_path / 'new.txt')
+
+    revisions = compare_releases(old, new, ['Series Code'], rtol=1e-6)
+    revised = revisions.loc[revisions['Status'] == 'revised']
+    assert revised[['Country Code', 'Year']].values.tolist() == [['BBB', 2000]]
+    assert revised['Change'].iloc[0] == 1.
+    assert sorted(revisions.loc[revisions['Status'] == 'added', 'Country Code']) == ['AAA', 'BBB']
+    assert revisions.loc[revisions['Status'] == 'removed', 'Country Code'].tolist() == ['CCC', 'CCC']
+
+    strict = compare_releases(old, new, ['Series Code'], rtol=1e-9)
+    assert (strict['Status'] == 'revised').sum() == 2
+    summary = summarize_revisions(strict, ['Series Code'])
+    assert summary.loc['NY.GDP.PCAP.KD'].tolist() == [2, 2, 2]
+
+
+def test_query_cache(tmp_path):
+    """ Cached results are read-only, positional and keyword calls share an entry and a refresh invalidates all
+        entries
+    """
+    filepath = tmp_path / 'gdp.txt'
+    write_gdp_file(filepath, [2000, 2001])
+    gdp = SyntheticGDPData(filepath)
+    gdp.enable_query_cache(maxsize=2)
+
+    years, values = gdp.create_timeseries_for_country_by_series_name('AAA', SERIES_NAME)
+    with pytest.raises(ValueError):
+        values[0] = 0.
+    gdp.create_timeseries_for_country_by_series_name(country_code='AAA', series_name=SERIES_NAME)
+    assert gdp.get_query_cache_info()[:4] == (1, 1, 2, 1)
+
+    write_gdp_file(filepath, [2000, 2001, 2002])
+    assert gdp.refresh() == 'appended'
+    years, values = gdp.create_timeseries_for_country_by_series_name('AAA', SERIES_NAME)
+    np.testing.assert_array_equal(years, [2000, 2001, 2002])
+    assert gdp.get_query_cache_info()[:4] == (1, 2, 2, 1)
+
+
+def test_get_series_cube(tmp_path):
+    """ Series and country codes keep the requested order and repetitions, years are restricted to the range, both
+        backends return the same cube
+    """
+    filepath = tmp_path / 'gdp.txt'
+    write_gdp_file(filepath, [2000, 2001, 2002], values={('BBB', 2001): '..'},
+                   series=((SERIES_NAME, SERIES_CODE), ('Population, total', 'SP.POP.TOTL')))
+    gdp = SyntheticGDPData(filepath)
+
+    cube = gdp.get_series_cube(['Population, total', SERIES_NAME, 'Population, total'], ['CCC', 'BBB', 'CCC'],
+                               years=(2001, 2002))
+    assert cube.series == ['Population, total', SERIES_NAME, 'Population, total']
+    assert cube.country_codes == ['CCC', 'BBB', 'CCC']
+    np.testing.assert_array_equal(cube.years, [2001, 2002])
+    np.testing.assert_array_equal(cube.values[1], [[4001., 4002.], [np.nan, 3002.], [4001., 4002.]])
+    np.testing.assert_array_equal(cube.values[0], [[104001., 104002.], [np.nan, 103002.], [104001., 104002.]])
+    np.testing.assert_array_equal(cube.values[2], cube.values[0])
+
+    by_code = gdp.get_series_cube(['SP.POP.TOTL', SERIES_CODE, 'SP.POP.TOTL'], ['CCC', 'BBB', 'CCC'],
+                                  years=(2001, 2002), by='Series Code')
+    np.testing.assert_array_equal(by_code.values, cube.values)
+
+    full = gdp.get_series_cube([SERIES_CODE], by='Series Code')
+    assert full.values.shape == (1, 3, 3) and full.country_codes == ['AAA', 'BBB', 'CCC']
+
+    with pytest.raises(KeyError):
+        gdp.get_series_cube([SERIES_NAME, 'Unknown series'])
+    with pytest.raises(KeyError):
+        gdp.get_series_cube([SERIES_NAME], ['AAA', 'ZZZ'])
+    with pytest.raises(ValueError):
+        gdp.get_series_cube([SERIES_NAME], by='Country Name')
+
+    # Empty selections return empty axes instead of failing
+    assert gdp.get_series_cube([], ['AAA']).values.shape == (0, 1, 3)
+    assert gdp.get_series_cube([SERIES_NAME], ['AAA'], years=(2010, 2020)).values.shape == (1, 1, 0)
+
+    pytest.importorskip('polars')
+    polars_cube = SyntheticGDPData(filepath, backend='polars').get_series_cube(
+        ['Population, total', SERIES_NAME, 'Population, total'], ['CCC', 'BBB', 'CCC'], years=(2001, 2002))
+    np.testing.assert_array_equal(polars_cube.values, cube.values)
+    np.testing.assert_array_equal(polars_cube.years, cube.years)
+
+
+class ListQueryHandler:
+    """ Minimal handler with a cached query taking a list, which can not be part of a cache key """
+
+    def __init__(self):
+        self.query_cache = QueryCache(maxsize=2)
+        self.data_version = 0
+
+    @cached_query
+    def get_totals(self, country_codes: list[str], scale=1.):
+        return np.array([scale * len(country_code) for country_code in country_codes])
+
+
+def test_query_cache_bypass_for_unhashable_arguments():
+    """ Calls with unhashable arguments are computed without caching, hashable calls of the same query are cached """
+    handler = ListQueryHandler()
+
+    totals = handler.get_totals(['AAA', 'BB'])
+    np.testing.assert_array_equal(totals, [3., 2.])
+    assert totals.flags.writeable
+    assert handler.query_cache.info()[:4] == (0, 0, 2, 0)
+
+    handler.get_totals(('AAA', 'BB'))
+    totals = handler.get_totals(country_codes=('AAA', 'BB'), scale=1.)
+    assert not totals.flags.writeable
+    assert handler.query_cache.info()[:4] == (1, 1, 2, 1)
+
+
+def test_energy_use_per_capita_on_sample_data():
+    """ The per-capita energy indicator resolves the quoted PPP series of the sample World Bank export """
+    gdp = SyntheticGDPData(os.path.join(DATA_DIRECTORY, 'GDP_percapita_allData.txt'))
+    assert 'GDP per capita, PPP (constant 2017 international $)' in set(gdp.data['Series Name'])
+
+    # The indicator only uses GDP series, the GDP data set stands in for the energy data
+    energy_use = IndicatorEngine(gdp, gdp).evaluate('energy_use_per_capita')
+    assert energy_use.shape[0] > 200
+    assert np.isfinite(energy_use[2014]).sum() > 150
+    assert 500 < energy_use.loc['DEU', 2014] < 10000
+
+
+def create_energy_data_stand_in(filepath, dependency_filepaths: list) -> GDPData:
+    """ A synthetic GDP data set standing in for the energy data (whose source file is not part of the repository),
+        with dependency files as those of IEAData
+    """
+    nrg_data = SyntheticGDPData(filepath)
+    nrg_data.dependency_filepaths = list(dependency_filepaths)
+    nrg_data.dependency_fingerprints = nrg_data.create_dependency_fingerprints()
+    return nrg_data
+
+
+def create_snapshot_handlers(tmp_path) -> (GDPData, GDPMetadata, GDPData):
+    """ Handlers for snapshot tests, the energy data depends on a copy of the country name edge cases """
+    write_gdp_file(tmp_path / 'gdp.txt', [2000, 2001])
+    write_gdp_file(tmp_path / 'energy.txt', [2000, 2001])
+    shutil.copy(interp.edge_cases_filepath, tmp_path / 'edge_cases.txt')
+    gdp_md = SampleGDPMetadata(os.path.join(DATA_DIRECTORY, 'GDP_metadata.csv'))
+    nrg_data = create_energy_data_stand_in(tmp_path / 'energy.txt', [tmp_path / 'edge_cases.txt'])
+    return SyntheticGDPData(tmp_path / 'gdp.txt'), gdp_md, nrg_data
+
+
+def test_snapshot_validation(tmp_path, monkeypatch):
+    """ Bundles are restored while all fingerprints and the version match, stale, outdated and truncated bundles
+        raise a ValueError
+    """
+    filepath = tmp_path / 'snapshot.pkl'
+    gdp, gdp_md, nrg_data = create_snapshot_handlers(tmp_path)
+    snapshot.save_snapshot(filepath, gdp, gdp_md, nrg_data)
+
+    restored_gdp, restored_gdp_md, _ = snapshot.load_snapshot(filepath)
+    assert restored_gdp.data.equals(gdp.data)
+    assert restored_gdp_md.regions == gdp_md.regions
+
+    # Changed source file
+    write_gdp_file(tmp_path / 'energy.txt', [2000, 2001], values={('AAA', 2000): 1.5})
+    assert not snapshot.is_snapshot_valid(snapshot.read_snapshot_header(filepath))
+    with pytest.raises(ValueError):
+        snapshot.load_snapshot(filepath)
+
+    # Changed dependency file
+    nrg_data.reload()
+    snapshot.save_snapshot(filepath, gdp, gdp_md, nrg_data)
+    assert snapshot.is_snapshot_valid(snapshot.read_snapshot_header(filepath))
+    with open(tmp_path / 'edge_cases.txt', 'a') as file:
+        file.write('Atlantis\t\t\t\tRepublic of Atlantis\n')
+    with pytest.raises(ValueError):
+        snapshot.load_snapshot(filepath)
+
+    # Outdated snapshot version
+    shutil.copy(interp.edge_cases_filepath, tmp_path / 'edge_cases.txt')
+    snapshot.load_snapshot(filepath)
+    monkeypatch.setattr(snapshot, 'snapshot_version', snapshot.snapshot_version + 1)
+    with pytest.raises(ValueError):
+        snapshot.load_snapshot(filepath)
+    monkeypatch.undo()
+
+    # Truncated bundles, within the handlers and within the header
+    content = filepath.read_bytes()
+    for size in [len(content) // 2, 10, 0]:
+        filepath.write_bytes(content[:size])
+        with pytest.raises(ValueError):
+            snapshot.load_snapshot(filepath)
+
+
+def test_load_data_rebuilds_invalid_snapshot(tmp_path, monkeypatch):
+    """ load_data rebuilds the handlers from the source files if the bundle is invalid and rewrites the bundle """
+    write_gdp_file(tmp_path / 'energy.txt', [2000, 2001])
+    monkeypatch.setattr(load_data, 'GDPData', SyntheticGDPData)
+    monkeypatch.setattr(load_data, 'GDPMetadata', SampleGDPMetadata)
+    monkeypatch.setattr(load_data, 'IEAData', lambda filepath, long_name_interpreter, dependency_filepaths:
+                        create_energy_data_stand_in(tmp_path / 'energy.txt', dependency_filepaths))
+
+    filepath = tmp_path / 'snapshot.pkl'
+    filepath.write_bytes(b'\x80\x05truncated')
+    gdp, gdp_md, nrg_data = load_data.load_data(filepath)
+    assert 'DEU' in gdp.available_country_codes
+    assert snapshot.is_snapshot_valid(snapshot.read_snapshot_header(filepath))
+
+    # The rewritten bundle is used without touching the source files
+    monkeypatch.setattr(load_data, 'GDPData', None)
+    restored_gdp, _, restored_nrg_data = load_data.load_data(filepath)
+    assert restored_gdp.data.equals(gdp.data)
+    assert restored_nrg_data.long_name_interpreter is not None
@@ -1,12 +1,19 @@
 from . import load_data
 from .src import data_preparation as data_prep
 
-from .src.plots_plotly import electricity_plot
-from .src.plots_highcharts import total_energy_supply_plot
+import os
+import subprocess
+import sys
+
+# Plotting backends are imported within the functions, so that importing the package for data-only jobs never loads
+# plotly or highcharts_core
+plotting_modules = ['plotly', 'highcharts_core']
 
 
 def test_plotly():
     """ Sample plot using plotly """
+    from .src.plots_plotly import electricity_plot
+
     gdp, gdp_md, nrg_data = load_data.load_data()
     plot_country_codes = data_prep.find_all_available_country_codes_and_sanitize(gdp, nrg_data)
 
@@ -15,7 +22,50 @@ def test_plotly():
 
 def test_highcharts():
     """ Sample plot using Highcharts """
+    from .src.plots_highcharts import total_energy_supply_plot
+
     gdp, gdp_md, nrg_data = load_data.load_data()
     plot_country_codes = data_prep.find_all_available_country_codes_and_sanitize(gdp, nrg_data)
 
-    return total_energy_supply_plot(2020, plot_country_codes, gdp, gdp_md, nrg_data)
\ No newline at end of file
+    return total_energy_supply_plot(2020, plot_country_codes, gdp, gdp_md, nrg_data)
+
+
+def measure_import_time(module: str) -> (float, list[str]):
+    """ Import a module of the package in a fresh interpreter via 'python -X importtime'
+
+        :arg
+            | module (str): module relative to the package, e.g. 'load_data'
+        :returns
+            | (float): cumulative import time of the module in seconds
+            | (list[str]): names of all modules imported along the way
+        :raises
+            RuntimeError: is raised if the import fails.
+    """
+    package_directory = os.path.dirname(os.path.abspath(__file__))
+    package_name = __package__ or os.path.basename(package_directory)
+    module_name = f'{package_name}.{module}'
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                            cwd=os.path.dirname(package_directory), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'Importing {module_name} failed:\n{result.stderr}')
+
+    # Lines are formatted as 'import time: self [us] | cumulative | imported package'
+    import_time, imported_modules = 0., []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported_modules.append(name.strip())
+        if name.strip() == module_name:
+            import_time = int(cumulative) / 1e6
+    return import_time, imported_modules
+
+
+def test_import_time(budget=1.5):
+    """ The data-only import path has to stay within the import time budget (s) and never import plotting backends """
+    import_time, imported_modules = measure_import_time('load_data')
+
+    loaded_backends = [name for name in imported_modules if name.split('.')[0] in plotting_modules]
+    assert not loaded_backends, f'Data-only import loaded plotting modules: {loaded_backends}'
+    assert import_time < budget, f'Importing load_data took {import_time:.2f} s (budget: {budget:.2f} s)'